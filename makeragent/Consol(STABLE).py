@@ -13,16 +13,65 @@ os.environ["OPENAI_MODEL"] = _ASI1_MODEL  # Override default model
 os.environ["_CHROMA_SKIP_OPENAI_WARNING"] = "1"
 
 import json
+import logging
+import math
 import requests
-from typing import List, Dict, Optional, Any, Tuple
-from dataclasses import dataclass, asdict, field
+from requests.adapters import HTTPAdapter
+from typing import List, Dict, DefaultDict, FrozenSet, Iterator, Optional, Any, Sequence, Tuple, Union
+from dataclasses import dataclass, asdict, field, replace
 import datetime
+import random
 import re
 import subprocess
+import urllib.parse
+import threading
+import queue
+import atexit
+import time
 import tempfile
 import hashlib
+import struct
+import sys
+import functools
+import heapq
+import itertools
+from collections import OrderedDict, defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
 import numpy as np
 
+# orjson is a faster drop-in for config JSON I/O; fall back to stdlib json if missing
+try:
+    import orjson
+    _ORJSON_AVAILABLE = True
+except ImportError:
+    _ORJSON_AVAILABLE = False
+
+_json_loads = orjson.loads if _ORJSON_AVAILABLE else json.loads
+
+# httpx (+ h2) lets the shared session multiplex Binance / LLM calls over HTTP/2 (opt-in)
+HTTP2_ENABLED = os.getenv("HTTP2_ENABLED", "false").lower() == "true"
+_HTTPX_AVAILABLE = False
+if HTTP2_ENABLED:
+    try:
+        import httpx
+        import h2  # noqa: F401  (httpx needs it for http2=True)
+        _HTTPX_AVAILABLE = True
+        print("[INIT] httpx loaded - external HTTP calls will use HTTP/2")
+    except ImportError:
+        print("[INIT] HTTP2_ENABLED set but httpx[http2] not installed. Using requests.")
+
+
+def _resp_json(resp: "requests.Response") -> Any:
+    """Decode an HTTP response body (orjson when available)."""
+    return _json_loads(resp.content)
+
+
+def _json_body(obj: Any) -> bytes:
+    """Serialize an outgoing JSON request body once, for requests' data=."""
+    if _ORJSON_AVAILABLE:
+        return orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(obj).encode()
+
 # Helper for timezone-aware UTC timestamps (Python 3.12+ compatible)
 def _utc_now() -> datetime.datetime:
     """Return current UTC time (timezone-aware)."""
@@ -44,6 +93,10 @@ def _utc_unix() -> int:
     """Return current UTC time as Unix timestamp."""
     return int(_utc_now().timestamp())
 
+def _utc_unix_ns() -> int:
+    """Return current UTC time as integer nanoseconds since the epoch."""
+    return time.time_ns()
+
 # Try to import Hyperon (MeTTa) for Windows/Python-native support
 try:
     from hyperon import MeTTa as HyperonMeTTa
@@ -53,6 +106,126 @@ except ImportError:
     _HYPERON_AVAILABLE = False
     print("[INIT] Hyperon library not found. Will try to use 'metta' CLI if available.")
 
+# Optional Numba JIT (opt-in: compile cost is paid at import) for the StrategyAgent pricing
+# kernel and the RiskEngine Monte Carlo drawdown
+STRATEGY_JIT = os.getenv("STRATEGY_JIT", "false").lower() == "true"
+RISK_JIT = os.getenv("RISK_JIT", "false").lower() == "true"
+_NUMBA_AVAILABLE = False
+if STRATEGY_JIT or RISK_JIT:
+    try:
+        from numba import njit as _njit, prange as _prange
+        _NUMBA_AVAILABLE = True
+        print("[INIT] Numba loaded - " + " and ".join(
+            name for name, on in (("StrategyAgent pricing kernel", STRATEGY_JIT), ("RiskEngine Monte Carlo", RISK_JIT)) if on
+        ) + " will be JIT-compiled")
+    except ImportError:
+        print("[INIT] STRATEGY_JIT/RISK_JIT set but numba not installed. Using pure-Python/NumPy kernels.")
+
+# Shared keep-alive session so Binance / MeTTa / LLM calls reuse pooled TCP+TLS connections.
+# Retries stay with the callers' own loops, hence max_retries=0 on the adapter.
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=32, max_retries=0))
+_SESSION.mount("http://", HTTPAdapter(pool_connections=4, pool_maxsize=32, max_retries=0))
+
+
+class _Http2Session:
+    """requests.Session look-alike over an HTTP/2 httpx.Client.
+
+    Callers keep their requests-based error handling: transport errors are re-raised as
+    requests exceptions and responses come back as requests.Response objects.
+    """
+
+    def __init__(self):
+        self._client = httpx.Client(
+            http2=True,
+            limits=httpx.Limits(max_connections=32, max_keepalive_connections=16),
+        )
+
+    def _request(self, method: str, url: str, data: Optional[bytes] = None, **kwargs) -> requests.Response:
+        try:
+            r = self._client.request(method, url, content=data, **kwargs)
+        except httpx.TimeoutException as e:
+            raise requests.Timeout(str(e)) from e
+        except httpx.TransportError as e:
+            raise requests.ConnectionError(str(e)) from e
+        resp = requests.Response()
+        resp.status_code = r.status_code
+        resp.headers = requests.structures.CaseInsensitiveDict(r.headers)
+        resp._content = r.content
+        resp.encoding = r.encoding
+        resp.reason = r.reason_phrase
+        resp.url = str(r.url)
+        return resp
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        return self._request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        return self._request("POST", url, **kwargs)
+
+
+if _HTTPX_AVAILABLE:
+    _SESSION = _Http2Session()
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling an endpoint whose circuit breaker is open."""
+
+
+class CircuitBreaker:
+    """Per-endpoint breaker: opens after `threshold` consecutive failures, then lets a single
+    half-open probe through every `cooldown` seconds until a call succeeds."""
+
+    def __init__(self, name: str, threshold: int = 5, cooldown: float = 30.0):
+        self.name = name
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.failures = 0
+        self.open_until = 0.0
+        self._lock = threading.Lock()
+
+    def before_call(self):
+        with self._lock:
+            if self.failures < self.threshold:
+                return
+            now = time.monotonic()
+            if now < self.open_until:
+                raise CircuitOpenError(f"[BREAKER] {self.name} open for another {self.open_until - now:.1f}s")
+            self.open_until = now + self.cooldown  # half-open: this caller is the probe
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.open_until = 0.0
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.failures >= self.threshold:
+                if self.failures == self.threshold:
+                    print(f"[BREAKER] {self.name} opened after {self.failures} consecutive failures")
+                self.open_until = time.monotonic() + self.cooldown
+
+    def trip(self, seconds: float):
+        """Open immediately for `seconds` (e.g. a server's Retry-After), whatever the failure count."""
+        with self._lock:
+            self.failures = max(self.failures, self.threshold)
+            self.open_until = max(self.open_until, time.monotonic() + seconds)
+        print(f"[BREAKER] {self.name} opened for {seconds:.0f}s at the server's request")
+
+
+_BREAKERS: Dict[str, CircuitBreaker] = {}
+_BREAKERS_LOCK = threading.Lock()
+
+
+def _breaker_for(endpoint: str) -> CircuitBreaker:
+    """Shared breaker per endpoint, so every client instance sees the same outage state."""
+    with _BREAKERS_LOCK:
+        breaker = _BREAKERS.get(endpoint)
+        if breaker is None:
+            breaker = _BREAKERS[endpoint] = CircuitBreaker(endpoint)
+        return breaker
+
 # ---- CONFIG ----
 LLM_API_ENDPOINT = os.getenv("LLM_API_ENDPOINT", "https://api.asi1.ai/v1")
 LLM_API_KEY = os.getenv("LLM_API_KEY", "sk_d95b81ac6db6406a82c9ba3baf078fa207b863c9a0d3422292c05033a3a2f397")
@@ -61,6 +234,8 @@ LLM_MODEL = os.getenv("LLM_MODEL", "asi1-extended")
 METTA_ENABLED = os.getenv("METTA_ENABLED", "true").lower() == "true"
 METTA_STORAGE_DIR = os.getenv("METTA_STORAGE_DIR", "./metta_kb")
 METTA_EXEC_PATH = os.getenv("METTA_EXEC_PATH", "metta")
+# Keep one interactive MeTTa CLI process alive instead of spawning one per query
+METTA_REPL = os.getenv("METTA_REPL", "false").lower() == "true"
 
 # Optional remote MeTTa / knowledge-graph backend (e.g. SingularityNET)
 USE_REMOTE_METTA = os.getenv("USE_REMOTE_METTA", "false").lower() == "true"
@@ -89,7 +264,10 @@ MAX_ITERATIONS = int(os.getenv("MAX_ITERATIONS", "4"))
 IMPROVEMENT_THRESHOLD = float(os.getenv("IMPROVEMENT_THRESHOLD", "0.1"))
 
 REASONING_LOG_FILE = 'reasoning_log.json'
-CONVERSATION_LOG_FILE = 'conversation_log.json'
+CONVERSATION_LOG_FILE = 'conversation_log.jsonl'  # append-only, one message per line
+# In-memory conversation caps; the JSONL log / Membase keep the full history
+MAX_CONVERSATION_USERS = int(os.getenv("MAX_CONVERSATION_USERS", "1000"))
+MAX_CONVERSATION_MESSAGES = int(os.getenv("MAX_CONVERSATION_MESSAGES", "200"))
 
 # --- MEMBASE CONFIG ---
 MEMBASE_ENABLED = os.getenv("MEMBASE_ENABLED", "true").lower() == "true"
@@ -111,7 +289,10 @@ ONCHAIN_REGISTER = os.getenv("ONCHAIN_REGISTER", "false").lower() == "true"
 
 # --- DATA MODELS ---
 
-@dataclass
+# Hot-path models are slotted where supported (dataclass slots= needs Python 3.10+)
+_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+@dataclass(**_SLOTS)
 class MarketData:
     pair: str
     current_price: float
@@ -206,7 +387,7 @@ class AutonomousReasoning:
 class MakerConfig:
     """Maker-specified constraints for quote generation."""
     maker_address: str = ""
-    allowed_pairs: List[str] = field(default_factory=list)
+    allowed_pairs: Sequence[str] = field(default_factory=tuple)  # stored as a tuple, see __setattr__
     max_trade_size: Optional[float] = None
     daily_caps: Dict[str, float] = field(default_factory=dict)  # token -> max daily volume
     paused: bool = False
@@ -215,14 +396,87 @@ class MakerConfig:
     default_ttl_sec: int = 60
     strategies: Dict[str, str] = field(default_factory=dict)  # strategyHash -> description
 
+    def __setattr__(self, name: str, value: Any) -> None:
+        # allowed_pairs is frozen to a tuple so it can only change by assignment, which
+        # rebuilds the pair set here; in-place edits fail loudly instead of going stale
+        if name == "allowed_pairs":
+            value = tuple(value)
+            object.__setattr__(self, "_allowed_pair_set", frozenset(value) | frozenset(
+                "/".join(reversed(p.split("/", 1))) for p in value if "/" in p
+            ))
+        object.__setattr__(self, name, value)
+
+    @property
+    def allowed_pair_set(self) -> FrozenSet[str]:
+        """Both directions of every allowed pair, for O(1) membership in generate_quote."""
+        return self._allowed_pair_set
+
 
 # --- STRATEGY AGENT DATA MODELS ---
 
+# chain_id + amount, packed ahead of the string fields when hashing idempotency keys
+_IDEMPOTENCY_HEADER = struct.Struct("<qd")
+
+@functools.lru_cache(maxsize=4096)
+def _pair_key(token_in: str, token_out: str) -> str:
+    """Interned "IN/OUT" key, built once per distinct pair."""
+    return sys.intern(f"{token_in}/{token_out}")
+
+
+@functools.lru_cache(maxsize=4096)
+def _default_strategy_hash(pair_key: str) -> str:
+    """Deterministic fallback strategy hash for a pair (pure, so memoized)."""
+    return hashlib.sha256(f"aqua_default_{pair_key}".encode()).hexdigest()[:16]
+
+
+def _calc_amounts_kernel(
+    side_is_buy: bool,
+    amount: float,
+    ask_price: float,
+    bid_price: float,
+    market_spread: int,
+    min_spread_bps: int,
+    max_spread_bps: int,
+    confidence: float
+) -> Tuple[float, float, int]:
+    """
+    Scalar pricing kernel behind StrategyAgent._calculate_amounts.
+    Returns (amount_in, amount_out, spread_bps).
+    """
+    # Determine spread based on market conditions and maker config
+    spread_bps = max(min_spread_bps, min(market_spread, max_spread_bps))
+
+    # Adjust spread based on pricing confidence
+    if confidence < 0.8:
+        spread_bps = int(spread_bps * 1.5)  # Widen spread for uncertain pricing
+
+    spread_multiplier = 1 + (spread_bps / 10000)
+
+    if side_is_buy:
+        # Taker wants to buy token_out, pays token_in
+        # amount is the desired amount_out; taker pays more
+        amount_out = amount
+        amount_in = amount_out * ask_price * spread_multiplier
+    else:
+        # Taker wants to sell token_in, receives token_out
+        # amount is the amount_in being sold; taker receives less
+        amount_in = amount
+        amount_out = amount_in / bid_price / spread_multiplier
+
+    return amount_in, amount_out, spread_bps
+
+
+if _NUMBA_AVAILABLE and STRATEGY_JIT:
+    _calc_amounts_kernel = _njit(cache=True)(_calc_amounts_kernel)
+    _calc_amounts_kernel(True, 1.0, 1.0, 1.0, 10, 10, 100, 1.0)  # Compile once at import
+
+
 class RejectReason:
     """Canonical reject reasons for quote requests."""
     MAKER_PAUSED = "MAKER_PAUSED"
     INSUFFICIENT_BUDGET = "INSUFFICIENT_BUDGET"
     STALE_PRICING = "STALE_PRICING"
+    INVALID_PRICING = "INVALID_PRICING"
     PAIR_NOT_ALLOWED = "PAIR_NOT_ALLOWED"
     EXCEEDS_MAX_TRADE_SIZE = "EXCEEDS_MAX_TRADE_SIZE"
     EXCEEDS_DAILY_CAP = "EXCEEDS_DAILY_CAP"
@@ -235,7 +489,60 @@ class RejectReason:
     INTERNAL_ERROR = "INTERNAL_ERROR"
 
 
-@dataclass
+# Feasibility checks reported on a successful quote, in generate_quote gate order
+_QUOTE_PASSED_CHECKS = (
+    "CHAIN_CHECK: PASSED",
+    "MAKER_PAUSED_CHECK: PASSED",
+    "PAIR_ALLOWED_CHECK: PASSED",
+    "PRICING_FRESHNESS_CHECK: PASSED",
+    "PRICING_VALID_CHECK: PASSED",
+    "STRATEGY_ACTIVE_CHECK: PASSED",
+    "STRATEGY_DOCKED_CHECK: PASSED",
+    "MAX_TRADE_SIZE_CHECK: PASSED",
+    "DAILY_CAP_CHECK: PASSED",
+    "BUDGET_CHECK: PASSED",
+    "ALLOWANCE_CHECK: PASSED",
+)
+
+# reason -> (explainability description, explainability rationale); str.format'd on demand
+_REJECT_TEMPLATES: Dict[str, Tuple[str, str]] = {
+    RejectReason.INVALID_CHAIN: (
+        "Quote rejected: unsupported chain {chain_id}",
+        "The requested chain is not in the list of supported chains"),
+    RejectReason.MAKER_PAUSED: (
+        "Quote rejected: maker is paused",
+        "The maker has paused quote generation"),
+    RejectReason.PAIR_NOT_ALLOWED: (
+        "Quote rejected: pair {pair} not allowed",
+        "Maker only allows: {allowed_pairs}"),
+    RejectReason.STALE_PRICING: (
+        "Quote rejected: stale pricing data",
+        "Pricing timestamp {timestamp} is too old"),
+    RejectReason.INVALID_PRICING: (
+        "Quote rejected: invalid pricing data",
+        "{side} quotes need a positive, finite {price_field}; got {price}"),
+    RejectReason.EXCEEDS_MAX_TRADE_SIZE: (
+        "Quote rejected: exceeds max trade size",
+        "Amount {amount} > max {max_trade_size}"),
+    RejectReason.EXCEEDS_DAILY_CAP: (
+        "Quote rejected: exceeds daily cap for {token}",
+        "Current: {current}, requested: {requested}, cap: {cap}"),
+    RejectReason.STRATEGY_INACTIVE: (
+        "Quote rejected: strategy inactive on-chain",
+        "The Aqua strategy has no tokens (rawBalances.tokensCount == 0)"),
+    RejectReason.STRATEGY_DOCKED: (
+        "Quote rejected: strategy is docked",
+        "The Aqua strategy is in DOCKED state and cannot process trades"),
+    RejectReason.INSUFFICIENT_BUDGET: (
+        "Quote rejected: insufficient budget",
+        "Strategy has {budget} {token}, need {needed}"),
+    RejectReason.INSUFFICIENT_ALLOWANCE: (
+        "Quote rejected: insufficient allowance",
+        "Maker → Aqua allowance is {allowance}, need {needed}"),
+}
+
+
+@dataclass(**_SLOTS)
 class QuoteRequest:
     """Incoming quote request from a taker."""
     chain_id: int
@@ -248,16 +555,18 @@ class QuoteRequest:
     idempotency_key: Optional[str] = None
     timestamp: str = field(default_factory=_utc_timestamp)
 
-    def __post_init__(self):
+    def __post_init__(self) -> None:
         if self.recipient is None:
             self.recipient = self.taker
         if self.idempotency_key is None:
-            # Generate deterministic idempotency key from request params
-            key_data = f"{self.chain_id}:{self.side}:{self.token_in}:{self.token_out}:{self.amount}:{self.taker}:{self.timestamp[:19]}"
-            self.idempotency_key = hashlib.sha256(key_data.encode()).hexdigest()[:16]
+            # Generate deterministic idempotency key from request params:
+            # numeric fields as raw bytes, string fields NUL-separated
+            h = hashlib.blake2b(_IDEMPOTENCY_HEADER.pack(int(self.chain_id), float(self.amount)), digest_size=8)
+            h.update("\x00".join((self.side, self.token_in, self.token_out, self.taker, self.timestamp[:19])).encode())
+            self.idempotency_key = h.hexdigest()
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class PricingSnapshot:
     """Current pricing data from pricing service."""
     token_in: str
@@ -271,7 +580,7 @@ class PricingSnapshot:
     confidence: float = 1.0  # 0-1, lower if pricing uncertain
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class ChainSnapshot:
     """On-chain state for feasibility checks."""
     chain_id: int
@@ -289,7 +598,7 @@ class ChainSnapshot:
         return self.is_active and not self.is_docked
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class QuoteIntent:
     """Deterministic quote intent output."""
     maker: str
@@ -315,7 +624,7 @@ class QuoteIntent:
     price_used: float = 0.0
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class QuoteExplainability:
     """Plain-language explanation of quote decision."""
     intent: QuoteIntent
@@ -326,6 +635,50 @@ class QuoteExplainability:
     warnings: List[str] = field(default_factory=list)
 
 
+class LazyExplainability(QuoteExplainability):
+    """
+    QuoteExplainability for reject paths whose description/rationale are formatted
+    from _REJECT_TEMPLATES only when first read, so callers that just inspect the
+    intent never pay for the strings. It is a real QuoteExplainability, so asdict(),
+    fields() and isinstance checks behave as for an eager one.
+    """
+    __slots__ = ("_reason", "_params")
+
+    @classmethod
+    def deferred(
+        cls,
+        intent: QuoteIntent,
+        pricing_source: str,
+        feasibility_checks: List[str],
+        reason: str,
+        params: Dict[str, Any]
+    ) -> "LazyExplainability":
+        """Build with description/rationale left unset until first access."""
+        self = cls.__new__(cls)
+        self.intent = intent
+        self.pricing_source = pricing_source
+        self.feasibility_checks = feasibility_checks
+        self.warnings = []
+        self._reason = reason
+        self._params = params
+        return self
+
+    def __getattr__(self, name: str) -> Any:
+        # Only reached while a field is still unset, i.e. on first read of the text
+        if name not in ("description", "rationale"):
+            raise AttributeError(name)
+        description, rationale = _REJECT_TEMPLATES[self._reason]
+        if self._params:
+            description = description.format(**self._params)
+            rationale = rationale.format(**self._params)
+        self.description = description
+        self.rationale = rationale
+        return description if name == "description" else rationale
+
+
+_strategy_logger = logging.getLogger("strategy_agent")
+
+
 class StrategyAgent:
     """
     Autonomous quoting brain that produces deterministic, on-chain-feasible quote intents.
@@ -337,42 +690,43 @@ class StrategyAgent:
     - State management (nonces, quote cache, fill tracking, budget snapshots)
     """
 
-    def __init__(self, supported_chains: List[int] = None):
-        self.supported_chains = supported_chains or [1, 56, 137, 42161]  # ETH, BSC, Polygon, Arbitrum
+    def __init__(self, supported_chains: Optional[List[int]] = None):
+        self.supported_chains = frozenset(supported_chains or [1, 56, 137, 42161])  # ETH, BSC, Polygon, Arbitrum
         
         # Per-maker state
-        self._maker_nonces: Dict[str, int] = {}  # maker_address -> current nonce
+        self._nonce_counters: DefaultDict[str, Iterator[int]] = defaultdict(itertools.count)  # maker_address -> nonce counter
+        self._maker_nonces: Dict[str, int] = {}  # maker_address -> next nonce (for reporting)
         self._quote_cache: Dict[str, QuoteIntent] = {}  # idempotency_key -> QuoteIntent
-        self._cache_expiry: Dict[str, int] = {}  # idempotency_key -> expiry timestamp
-        self._daily_volumes: Dict[str, Dict[str, float]] = {}  # maker -> token -> volume today
+        self._cache_expiry: Dict[str, int] = {}  # idempotency_key -> expiry (Unix ns)
+        self._cache_heap: List[Tuple[int, str]] = []  # (expiry ns, idempotency_key) min-heap for sweeping
+        self._daily_volumes: Dict[Tuple[str, str], float] = {}  # (maker, token) -> volume today
         self._last_volume_reset: str = _utc_date_str()
         
-        # Fill/revert tracking
-        self._fills: Dict[str, Dict] = {}  # nonce -> fill data
-        self._reverts: Dict[str, Dict] = {}  # nonce -> revert data
+        # Fill/revert tracking, bucketed per maker so stats are a len() lookup
+        self._fills: Dict[str, Dict[int, Dict[str, Any]]] = {}  # maker -> nonce -> fill data
+        self._reverts: Dict[str, Dict[int, Dict[str, Any]]] = {}  # maker -> nonce -> revert data
         
-        print("[STRATEGY_AGENT] Initialized")
+        _strategy_logger.debug("Initialized (chains=%s)", sorted(self.supported_chains))
 
-    def _reset_daily_volumes_if_needed(self):
+    def _reset_daily_volumes_if_needed(self, today: Optional[str] = None) -> None:
         """Reset daily volume tracking at midnight UTC."""
-        today = _utc_date_str()
+        if today is None:
+            today = _utc_date_str()
         if today != self._last_volume_reset:
             self._daily_volumes.clear()
             self._last_volume_reset = today
 
     def _get_next_nonce(self, maker: str) -> int:
         """Get and increment monotonic nonce for maker."""
-        if maker not in self._maker_nonces:
-            self._maker_nonces[maker] = 0
-        nonce = self._maker_nonces[maker]
-        self._maker_nonces[maker] += 1
+        nonce = next(self._nonce_counters[maker])
+        self._maker_nonces[maker] = nonce + 1
         return nonce
 
-    def _get_cached_quote(self, idempotency_key: str) -> Optional[QuoteIntent]:
+    def _get_cached_quote(self, idempotency_key: str, now_ns: Optional[int] = None) -> Optional[QuoteIntent]:
         """Return cached quote if still valid."""
         if idempotency_key in self._quote_cache:
-            expiry = self._cache_expiry.get(idempotency_key, 0)
-            if _utc_unix() < expiry:
+            expiry_ns = self._cache_expiry.get(idempotency_key, 0)
+            if (now_ns if now_ns is not None else _utc_unix_ns()) < expiry_ns:
                 return self._quote_cache[idempotency_key]
             else:
                 # Expired, remove from cache
@@ -380,29 +734,40 @@ class StrategyAgent:
                 del self._cache_expiry[idempotency_key]
         return None
 
-    def _cache_quote(self, quote: QuoteIntent):
+    def _cache_quote(self, quote: QuoteIntent) -> None:
         """Cache quote by idempotency key."""
+        # Expiry is kept in integer ns internally; QuoteIntent.expiry stays in seconds
+        expiry_ns = quote.expiry * 1_000_000_000
         self._quote_cache[quote.idempotency_key] = quote
-        self._cache_expiry[quote.idempotency_key] = quote.expiry
-
-    def _update_daily_volume(self, maker: str, token: str, amount: float):
+        self._cache_expiry[quote.idempotency_key] = expiry_ns
+        heapq.heappush(self._cache_heap, (expiry_ns, quote.idempotency_key))
+
+    def _sweep_expired(self, now_ns: int) -> None:
+        """Evict expired quotes, including keys that are never requested again."""
+        heap = self._cache_heap
+        while heap and heap[0][0] <= now_ns:
+            expiry, key = heapq.heappop(heap)
+            # Skip stale heap entries for keys that were evicted or re-cached since
+            if self._cache_expiry.get(key) == expiry:
+                del self._quote_cache[key]
+                del self._cache_expiry[key]
+
+    def _update_daily_volume(self, maker: str, token: str, amount: float) -> None:
         """Track daily volume for cap enforcement."""
-        if maker not in self._daily_volumes:
-            self._daily_volumes[maker] = {}
-        if token not in self._daily_volumes[maker]:
-            self._daily_volumes[maker][token] = 0.0
-        self._daily_volumes[maker][token] += amount
+        key = (maker, token)
+        self._daily_volumes[key] = self._daily_volumes.get(key, 0.0) + amount
 
     def _get_daily_volume(self, maker: str, token: str) -> float:
         """Get current daily volume for a token."""
-        return self._daily_volumes.get(maker, {}).get(token, 0.0)
+        return self._daily_volumes.get((maker, token), 0.0)
 
     def _create_rejected_intent(
         self,
         request: QuoteRequest,
         maker_config: MakerConfig,
         reason: str,
-        rationale: str
+        rationale: str,
+        created_at: Optional[str] = None
     ) -> QuoteIntent:
         """Create a rejected QuoteIntent with reason."""
         return QuoteIntent(
@@ -417,30 +782,45 @@ class StrategyAgent:
             min_out_net=0.0,
             ttl_sec=0,
             idempotency_key=request.idempotency_key,
+            created_at=created_at or _utc_timestamp(),
             reason=reason,
             rejected=True,
             rationale=rationale
         )
 
+    def _reject(
+        self,
+        request: QuoteRequest,
+        maker_config: MakerConfig,
+        reason: str,
+        rationale: str,
+        created_at: str,
+        pricing_source: str,
+        failed_check: str,
+        **params: Any
+    ) -> Tuple[QuoteIntent, QuoteExplainability]:
+        """Rejected intent plus an explainability whose text is built on demand from `params`."""
+        intent = self._create_rejected_intent(request, maker_config, reason, rationale, created_at)
+        return intent, LazyExplainability.deferred(intent, pricing_source, [failed_check], reason, params)
+
     def _select_strategy_hash(
         self,
         maker_config: MakerConfig,
         token_in: str,
         token_out: str
-    ) -> Optional[str]:
+    ) -> str:
         """Select appropriate strategy hash for the pair."""
-        pair_key = f"{token_in}/{token_out}"
-        reverse_key = f"{token_out}/{token_in}"
+        pair_key = _pair_key(token_in, token_out)
         
         # Check if maker has a specific strategy for this pair
         if pair_key in maker_config.strategies:
             return maker_config.strategies[pair_key]
+        reverse_key = _pair_key(token_out, token_in)
         if reverse_key in maker_config.strategies:
             return maker_config.strategies[reverse_key]
         
         # Default strategy hash (would be configured per deployment)
-        default_hash = hashlib.sha256(f"aqua_default_{pair_key}".encode()).hexdigest()[:16]
-        return default_hash
+        return _default_strategy_hash(pair_key)
 
     def _calculate_amounts(
         self,
@@ -452,30 +832,16 @@ class StrategyAgent:
         Calculate side-aware amountIn/amountOut and spread.
         Returns (amount_in, amount_out, spread_bps).
         """
-        # Determine spread based on market conditions and maker config
-        market_spread = pricing.spread_bps
-        spread_bps = max(maker_config.min_spread_bps, min(market_spread, maker_config.max_spread_bps))
-        
-        # Adjust spread based on pricing confidence
-        if pricing.confidence < 0.8:
-            spread_bps = int(spread_bps * 1.5)  # Widen spread for uncertain pricing
-        
-        spread_multiplier = 1 + (spread_bps / 10000)
-        
-        if request.side == "BUY":
-            # Taker wants to buy token_out, pays token_in
-            # request.amount is the desired amount_out
-            amount_out = request.amount
-            # Calculate amount_in with spread (taker pays more)
-            amount_in = amount_out * pricing.ask_price * spread_multiplier
-        else:  # SELL
-            # Taker wants to sell token_in, receives token_out
-            # request.amount is the amount_in being sold
-            amount_in = request.amount
-            # Calculate amount_out with spread (taker receives less)
-            amount_out = amount_in / pricing.bid_price / spread_multiplier
-        
-        return amount_in, amount_out, spread_bps
+        return _calc_amounts_kernel(
+            request.side == "BUY",
+            float(request.amount),
+            float(pricing.ask_price),
+            float(pricing.bid_price),
+            int(pricing.spread_bps),
+            int(maker_config.min_spread_bps),
+            int(maker_config.max_spread_bps),
+            float(pricing.confidence)
+        )
 
     def generate_quote(
         self,
@@ -488,17 +854,79 @@ class StrategyAgent:
         Generate a deterministic quote intent for the given request.
         
         Returns:
-            Tuple of (QuoteIntent, QuoteExplainability)
+            Tuple of (QuoteIntent, QuoteExplainability); on rejects it is a
+            LazyExplainability that formats its text on first read
             
         The QuoteIntent will have rejected=True and reason set if the quote
         cannot be fulfilled due to policy or feasibility issues.
         """
-        self._reset_daily_volumes_if_needed()
-        feasibility_checks = []
+        return self._generate_quote(request, maker_config, pricing, chain_snapshot)
+
+    def generate_quotes_batch(
+        self,
+        requests: List[QuoteRequest],
+        maker_config: MakerConfig,
+        pricings: List[PricingSnapshot],
+        chain_snapshots: List[ChainSnapshot]
+    ) -> List[Tuple[QuoteIntent, QuoteExplainability]]:
+        """
+        Generate quotes for many requests against one maker config.
+
+        Amounts and spreads for the whole batch are computed column-wise with
+        NumPy; the feasibility gates, nonce allocation, caching and daily-volume
+        tracking then run per request in order, exactly as in generate_quote.
+        """
+        if not (len(requests) == len(pricings) == len(chain_snapshots)):
+            raise ValueError("requests, pricings and chain_snapshots must have the same length")
+        if not requests:
+            return []
+
+        # Request/pricing fields as parallel columns
+        is_buy = np.fromiter((r.side == "BUY" for r in requests), dtype=bool, count=len(requests))
+        amounts = np.fromiter((r.amount for r in requests), dtype=np.float64, count=len(requests))
+        ask_prices = np.fromiter((p.ask_price for p in pricings), dtype=np.float64, count=len(pricings))
+        bid_prices = np.fromiter((p.bid_price for p in pricings), dtype=np.float64, count=len(pricings))
+        market_spreads = np.fromiter((p.spread_bps for p in pricings), dtype=np.int64, count=len(pricings))
+        confidences = np.fromiter((p.confidence for p in pricings), dtype=np.float64, count=len(pricings))
+
+        # Same math as _calc_amounts_kernel, one column at a time
+        spread_bps = np.maximum(maker_config.min_spread_bps, np.minimum(market_spreads, maker_config.max_spread_bps))
+        spread_bps = np.where(confidences < 0.8, (spread_bps * 1.5).astype(np.int64), spread_bps)
+        spread_multiplier = 1 + (spread_bps / 10000)
+        # Sells only divide by a usable bid; other rows are rejected by the pricing gate before
+        # their amounts are read, so they are left as NaN instead of raising FP warnings
+        sell_ok = ~is_buy & (bid_prices > 0) & np.isfinite(bid_prices)
+        amounts_in = np.where(is_buy, amounts * ask_prices * spread_multiplier, amounts)
+        amounts_out = np.divide(amounts, bid_prices, out=np.full(len(requests), np.nan), where=sell_ok)
+        amounts_out = np.where(is_buy, amounts, amounts_out / spread_multiplier)
+
+        return [
+            self._generate_quote(
+                request, maker_config, pricing, chain_snapshot,
+                (float(amounts_in[i]), float(amounts_out[i]), int(spread_bps[i]))
+            )
+            for i, (request, pricing, chain_snapshot) in enumerate(zip(requests, pricings, chain_snapshots))
+        ]
+
+    def _generate_quote(
+        self,
+        request: QuoteRequest,
+        maker_config: MakerConfig,
+        pricing: PricingSnapshot,
+        chain_snapshot: ChainSnapshot,
+        amounts: Optional[Tuple[float, float, int]] = None
+    ) -> Tuple[QuoteIntent, QuoteExplainability]:
+        """Run the quote pipeline; `amounts` is supplied precomputed by the batch path."""
+        # Read the clock once per quote; everything below reuses it
+        now_ns = _utc_unix_ns()
+        now = now_ns // 1_000_000_000
+        now_dt = datetime.datetime.fromtimestamp(now_ns / 1e9, datetime.timezone.utc)
+        self._reset_daily_volumes_if_needed(now_dt.date().isoformat())
+        self._sweep_expired(now_ns)
         warnings = []
 
         # 1. Check idempotency - return cached quote if exists
-        cached = self._get_cached_quote(request.idempotency_key)
+        cached = self._get_cached_quote(request.idempotency_key, now_ns)
         if cached is not None:
             return cached, QuoteExplainability(
                 intent=cached,
@@ -508,170 +936,121 @@ class StrategyAgent:
                 feasibility_checks=["IDEMPOTENCY_HIT"]
             )
 
+        created_at = now_dt.isoformat()
+
         # 2. Validate chain
         if request.chain_id not in self.supported_chains:
-            intent = self._create_rejected_intent(
+            return self._reject(
                 request, maker_config, RejectReason.INVALID_CHAIN,
-                f"Chain {request.chain_id} not supported"
-            )
-            return intent, QuoteExplainability(
-                intent=intent,
-                description=f"Quote rejected: unsupported chain {request.chain_id}",
-                rationale="The requested chain is not in the list of supported chains",
-                pricing_source="none",
-                feasibility_checks=["CHAIN_CHECK: FAILED"]
+                f"Chain {request.chain_id} not supported", created_at,
+                "none", "CHAIN_CHECK: FAILED",
+                chain_id=request.chain_id
             )
-        feasibility_checks.append("CHAIN_CHECK: PASSED")
 
         # 3. Check maker paused state
         if maker_config.paused:
-            intent = self._create_rejected_intent(
+            return self._reject(
                 request, maker_config, RejectReason.MAKER_PAUSED,
-                "Maker is currently paused"
-            )
-            return intent, QuoteExplainability(
-                intent=intent,
-                description="Quote rejected: maker is paused",
-                rationale="The maker has paused quote generation",
-                pricing_source="none",
-                feasibility_checks=["MAKER_PAUSED_CHECK: FAILED"]
+                "Maker is currently paused", created_at,
+                "none", "MAKER_PAUSED_CHECK: FAILED"
             )
-        feasibility_checks.append("MAKER_PAUSED_CHECK: PASSED")
 
         # 4. Check pair allowed
-        pair = f"{request.token_in}/{request.token_out}"
-        reverse_pair = f"{request.token_out}/{request.token_in}"
-        if maker_config.allowed_pairs and pair not in maker_config.allowed_pairs and reverse_pair not in maker_config.allowed_pairs:
-            intent = self._create_rejected_intent(
+        pair = _pair_key(request.token_in, request.token_out)
+        if maker_config.allowed_pairs and pair not in maker_config.allowed_pair_set:
+            return self._reject(
                 request, maker_config, RejectReason.PAIR_NOT_ALLOWED,
-                f"Pair {pair} not in allowed list"
+                f"Pair {pair} not in allowed list", created_at,
+                "none", "PAIR_ALLOWED_CHECK: FAILED",
+                pair=pair, allowed_pairs=list(maker_config.allowed_pairs)
             )
-            return intent, QuoteExplainability(
-                intent=intent,
-                description=f"Quote rejected: pair {pair} not allowed",
-                rationale=f"Maker only allows: {maker_config.allowed_pairs}",
-                pricing_source="none",
-                feasibility_checks=["PAIR_ALLOWED_CHECK: FAILED"]
-            )
-        feasibility_checks.append("PAIR_ALLOWED_CHECK: PASSED")
 
         # 5. Check pricing staleness
         if pricing.is_stale:
-            intent = self._create_rejected_intent(
+            return self._reject(
                 request, maker_config, RejectReason.STALE_PRICING,
-                "Pricing data is stale"
+                "Pricing data is stale", created_at,
+                pricing.timestamp, "PRICING_FRESHNESS_CHECK: FAILED",
+                timestamp=pricing.timestamp
+            )
+
+        # 5b. Check the price this side divides/multiplies by is usable
+        price_field = "ask_price" if request.side == "BUY" else "bid_price"
+        price = getattr(pricing, price_field)
+        if not 0 < price < math.inf:
+            return self._reject(
+                request, maker_config, RejectReason.INVALID_PRICING,
+                f"Pricing {price_field} is not a positive finite number", created_at,
+                pricing.timestamp, "PRICING_VALID_CHECK: FAILED",
+                side=request.side, price_field=price_field, price=price
+            )
+
+        # 6. On-chain feasibility: strategy active
+        if not chain_snapshot.is_active:
+            return self._reject(
+                request, maker_config, RejectReason.STRATEGY_INACTIVE,
+                "Strategy is not active (tokensCount == 0)", created_at,
+                pricing.timestamp, "STRATEGY_ACTIVE_CHECK: FAILED"
             )
-            return intent, QuoteExplainability(
-                intent=intent,
-                description="Quote rejected: stale pricing data",
-                rationale=f"Pricing timestamp {pricing.timestamp} is too old",
-                pricing_source=pricing.timestamp,
-                feasibility_checks=["PRICING_FRESHNESS_CHECK: FAILED"]
+
+        # 7. On-chain feasibility: strategy not docked
+        if chain_snapshot.is_docked:
+            return self._reject(
+                request, maker_config, RejectReason.STRATEGY_DOCKED,
+                "Strategy is DOCKED", created_at,
+                pricing.timestamp, "STRATEGY_DOCKED_CHECK: FAILED"
             )
-        feasibility_checks.append("PRICING_FRESHNESS_CHECK: PASSED")
 
-        # 6. Calculate amounts
-        amount_in, amount_out, spread_bps = self._calculate_amounts(request, pricing, maker_config)
+        # 8. Calculate amounts (the remaining gates depend on them)
+        if amounts is None:
+            amounts = self._calculate_amounts(request, pricing, maker_config)
+        amount_in, amount_out, spread_bps = amounts
 
-        # 7. Check max trade size
+        # 9. Check max trade size
         if maker_config.max_trade_size is not None:
             if amount_in > maker_config.max_trade_size or amount_out > maker_config.max_trade_size:
-                intent = self._create_rejected_intent(
+                return self._reject(
                     request, maker_config, RejectReason.EXCEEDS_MAX_TRADE_SIZE,
-                    f"Trade size exceeds max {maker_config.max_trade_size}"
+                    f"Trade size exceeds max {maker_config.max_trade_size}", created_at,
+                    pricing.timestamp, "MAX_TRADE_SIZE_CHECK: FAILED",
+                    amount=max(amount_in, amount_out), max_trade_size=maker_config.max_trade_size
                 )
-                return intent, QuoteExplainability(
-                    intent=intent,
-                    description=f"Quote rejected: exceeds max trade size",
-                    rationale=f"Amount {max(amount_in, amount_out)} > max {maker_config.max_trade_size}",
-                    pricing_source=pricing.timestamp,
-                    feasibility_checks=["MAX_TRADE_SIZE_CHECK: FAILED"]
-                )
-        feasibility_checks.append("MAX_TRADE_SIZE_CHECK: PASSED")
 
-        # 8. Check daily caps
+        # 10. Check daily caps
         token_out_daily = self._get_daily_volume(maker_config.maker_address, request.token_out)
         if request.token_out in maker_config.daily_caps:
             cap = maker_config.daily_caps[request.token_out]
             if token_out_daily + amount_out > cap:
-                intent = self._create_rejected_intent(
+                return self._reject(
                     request, maker_config, RejectReason.EXCEEDS_DAILY_CAP,
-                    f"Would exceed daily cap for {request.token_out}"
-                )
-                return intent, QuoteExplainability(
-                    intent=intent,
-                    description=f"Quote rejected: exceeds daily cap for {request.token_out}",
-                    rationale=f"Current: {token_out_daily}, requested: {amount_out}, cap: {cap}",
-                    pricing_source=pricing.timestamp,
-                    feasibility_checks=["DAILY_CAP_CHECK: FAILED"]
+                    f"Would exceed daily cap for {request.token_out}", created_at,
+                    pricing.timestamp, "DAILY_CAP_CHECK: FAILED",
+                    token=request.token_out, current=token_out_daily, requested=amount_out, cap=cap
                 )
-        feasibility_checks.append("DAILY_CAP_CHECK: PASSED")
-
-        # 9. On-chain feasibility: strategy active
-        if not chain_snapshot.is_active:
-            intent = self._create_rejected_intent(
-                request, maker_config, RejectReason.STRATEGY_INACTIVE,
-                "Strategy is not active (tokensCount == 0)"
-            )
-            return intent, QuoteExplainability(
-                intent=intent,
-                description="Quote rejected: strategy inactive on-chain",
-                rationale="The Aqua strategy has no tokens (rawBalances.tokensCount == 0)",
-                pricing_source=pricing.timestamp,
-                feasibility_checks=["STRATEGY_ACTIVE_CHECK: FAILED"]
-            )
-        feasibility_checks.append("STRATEGY_ACTIVE_CHECK: PASSED")
-
-        # 10. On-chain feasibility: strategy not docked
-        if chain_snapshot.is_docked:
-            intent = self._create_rejected_intent(
-                request, maker_config, RejectReason.STRATEGY_DOCKED,
-                "Strategy is DOCKED"
-            )
-            return intent, QuoteExplainability(
-                intent=intent,
-                description="Quote rejected: strategy is docked",
-                rationale="The Aqua strategy is in DOCKED state and cannot process trades",
-                pricing_source=pricing.timestamp,
-                feasibility_checks=["STRATEGY_DOCKED_CHECK: FAILED"]
-            )
-        feasibility_checks.append("STRATEGY_DOCKED_CHECK: PASSED")
 
         # 11. On-chain feasibility: sufficient tokenOut budget
         if chain_snapshot.token_out_budget < amount_out:
-            intent = self._create_rejected_intent(
+            return self._reject(
                 request, maker_config, RejectReason.INSUFFICIENT_BUDGET,
-                f"Insufficient tokenOut budget: {chain_snapshot.token_out_budget} < {amount_out}"
+                f"Insufficient tokenOut budget: {chain_snapshot.token_out_budget} < {amount_out}", created_at,
+                pricing.timestamp, "BUDGET_CHECK: FAILED",
+                budget=chain_snapshot.token_out_budget, token=request.token_out, needed=amount_out
             )
-            return intent, QuoteExplainability(
-                intent=intent,
-                description="Quote rejected: insufficient budget",
-                rationale=f"Strategy has {chain_snapshot.token_out_budget} {request.token_out}, need {amount_out}",
-                pricing_source=pricing.timestamp,
-                feasibility_checks=["BUDGET_CHECK: FAILED"]
-            )
-        feasibility_checks.append("BUDGET_CHECK: PASSED")
 
         # 12. On-chain feasibility: sufficient allowance
         if chain_snapshot.maker_allowance < amount_out:
-            intent = self._create_rejected_intent(
+            return self._reject(
                 request, maker_config, RejectReason.INSUFFICIENT_ALLOWANCE,
-                f"Insufficient maker allowance: {chain_snapshot.maker_allowance} < {amount_out}"
-            )
-            return intent, QuoteExplainability(
-                intent=intent,
-                description="Quote rejected: insufficient allowance",
-                rationale=f"Maker → Aqua allowance is {chain_snapshot.maker_allowance}, need {amount_out}",
-                pricing_source=pricing.timestamp,
-                feasibility_checks=["ALLOWANCE_CHECK: FAILED"]
+                f"Insufficient maker allowance: {chain_snapshot.maker_allowance} < {amount_out}", created_at,
+                pricing.timestamp, "ALLOWANCE_CHECK: FAILED",
+                allowance=chain_snapshot.maker_allowance, needed=amount_out
             )
-        feasibility_checks.append("ALLOWANCE_CHECK: PASSED")
 
         # 13. All checks passed - generate quote intent
         strategy_hash = self._select_strategy_hash(maker_config, request.token_in, request.token_out)
         nonce = self._get_next_nonce(maker_config.maker_address)
         ttl_sec = maker_config.default_ttl_sec
-        expiry = _utc_unix() + ttl_sec
+        expiry = now + ttl_sec
         
         # Calculate minOutNet (amount_out minus estimated fees, e.g., 0.1%)
         fee_bps = 10  # 0.1% fee estimate
@@ -699,6 +1078,7 @@ class StrategyAgent:
             min_out_net=min_out_net,
             ttl_sec=ttl_sec,
             idempotency_key=request.idempotency_key,
+            created_at=created_at,
             rationale=rationale,
             spread_bps=spread_bps,
             price_used=pricing.mid_price
@@ -721,47 +1101,90 @@ class StrategyAgent:
             description=f"Quote generated successfully for {request.side} {pair}",
             rationale=rationale,
             pricing_source=pricing.timestamp,
-            feasibility_checks=feasibility_checks,
+            feasibility_checks=list(_QUOTE_PASSED_CHECKS),
             warnings=warnings
         )
 
         return intent, explainability
 
-    def record_fill(self, maker: str, nonce: int, tx_hash: str, actual_out: float):
+    def record_fill(self, maker: str, nonce: int, tx_hash: str, actual_out: float) -> None:
         """Record a successful fill for tracking."""
-        key = f"{maker}:{nonce}"
-        self._fills[key] = {
+        self._fills.setdefault(maker, {})[nonce] = {
             "tx_hash": tx_hash,
             "actual_out": actual_out,
             "timestamp": _utc_timestamp()
         }
 
-    def record_revert(self, maker: str, nonce: int, reason: str):
+    def record_revert(self, maker: str, nonce: int, reason: str) -> None:
         """Record a revert for analysis."""
-        key = f"{maker}:{nonce}"
-        self._reverts[key] = {
+        self._reverts.setdefault(maker, {})[nonce] = {
             "reason": reason,
             "timestamp": _utc_timestamp()
         }
         # Log for debugging - this should never happen if feasibility checks are correct
-        print(f"[STRATEGY_AGENT] WARNING: Revert recorded for {key}: {reason}")
+        _strategy_logger.warning("Revert recorded for %s:%s: %s", maker, nonce, reason)
 
     def get_maker_stats(self, maker: str) -> Dict[str, Any]:
         """Get statistics for a maker."""
-        fills = sum(1 for k in self._fills if k.startswith(maker))
-        reverts = sum(1 for k in self._reverts if k.startswith(maker))
+        fills = len(self._fills.get(maker, {}))
+        reverts = len(self._reverts.get(maker, {}))
         return {
             "maker": maker,
             "current_nonce": self._maker_nonces.get(maker, 0),
             "fills": fills,
             "reverts": reverts,
             "revert_rate": reverts / max(fills + reverts, 1),
-            "daily_volumes": self._daily_volumes.get(maker, {})
+            "daily_volumes": {tok: v for (m, tok), v in self._daily_volumes.items() if m == maker}
         }
 
 
 # --- CONFIG MANAGER ---
 
+# path -> (mtime_ns, parsed JSON); lets repeated ConfigManager() calls skip re-parsing
+_CONFIG_JSON_CACHE: Dict[str, Tuple[int, Any]] = {}
+
+
+def _read_config_json(path: str) -> Any:
+    """Parse a JSON config file, reusing the last parse while its mtime is unchanged."""
+    mtime = os.stat(path).st_mtime_ns
+    cached = _CONFIG_JSON_CACHE.get(path)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+    with open(path, 'rb') as f:
+        data = _json_loads(f.read())
+    _CONFIG_JSON_CACHE[path] = (mtime, data)
+    return data
+
+
+def _write_config_json(path: str, data: Any) -> None:
+    """Write a JSON config file (indented) and keep the parse cache in sync."""
+    if _ORJSON_AVAILABLE:
+        blob = orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    else:
+        blob = json.dumps(data, indent=2).encode()
+    with open(path, 'wb') as f:
+        f.write(blob)
+    _CONFIG_JSON_CACHE[path] = (os.stat(path).st_mtime_ns, data)
+
+
+@dataclass(frozen=True, **_SLOTS)
+class TradingThresholds:
+    """The trading_rules limits validate_strategy checks, resolved once per rules dict."""
+    min_rr_ratio: float
+    max_position_size: float
+    min_confidence: float
+    min_liquidity_score: float
+
+    @classmethod
+    def from_rules(cls, rules: Dict[str, Any]) -> "TradingThresholds":
+        return cls(
+            min_rr_ratio=rules.get("min_rr_ratio", 1.5),
+            max_position_size=rules.get("max_position_size", 100000),
+            min_confidence=rules.get("min_confidence", 0.6),
+            min_liquidity_score=rules.get("min_liquidity_score", 60.0),
+        )
+
+
 class ConfigManager:
     """Load and manage configuration from external files."""
     
@@ -770,6 +1193,7 @@ class ConfigManager:
         self._ensure_config_dir()
         self.tokens = self._load_tokens()
         self.trading_rules = self._load_trading_rules()
+        self._thresholds: Optional[Tuple[Dict[str, Any], TradingThresholds]] = None
         self.user_profiles = self._load_user_profiles()
         self.pairs = self._load_pairs()
 
@@ -779,8 +1203,7 @@ class ConfigManager:
     def _load_tokens(self) -> Dict[str, Any]:
         if os.path.exists(TOKENS_CONFIG):
             try:
-                with open(TOKENS_CONFIG, 'r') as f:
-                    return json.load(f)
+                return _read_config_json(TOKENS_CONFIG)
             except Exception as e:
                 print(f"[WARN] Failed to load tokens: {e}")
         
@@ -795,8 +1218,7 @@ class ConfigManager:
     def _load_pairs(self) -> List[str]:
         if os.path.exists(PAIRS_CONFIG):
             try:
-                with open(PAIRS_CONFIG, 'r') as f:
-                    return json.load(f)
+                return _read_config_json(PAIRS_CONFIG)
             except Exception as e:
                 print(f"[WARN] Failed to load pairs: {e}")
         
@@ -810,8 +1232,7 @@ class ConfigManager:
     def _load_trading_rules(self) -> Dict[str, Any]:
         if os.path.exists(TRADING_RULES_CONFIG):
             try:
-                with open(TRADING_RULES_CONFIG, 'r') as f:
-                    return json.load(f)
+                return _read_config_json(TRADING_RULES_CONFIG)
             except Exception as e:
                 print(f"[WARN] Failed to load trading rules: {e}")
         
@@ -832,8 +1253,7 @@ class ConfigManager:
     def _load_user_profiles(self) -> Dict[str, Any]:
         if os.path.exists(USER_PROFILES_CONFIG):
             try:
-                with open(USER_PROFILES_CONFIG, 'r') as f:
-                    return json.load(f)
+                return _read_config_json(USER_PROFILES_CONFIG)
             except Exception as e:
                 print(f"[WARN] Failed to load user profiles: {e}")
         
@@ -868,23 +1288,19 @@ class ConfigManager:
 
     def _save_tokens(self, tokens: Dict[str, Any]):
         os.makedirs(self.config_dir, exist_ok=True)
-        with open(TOKENS_CONFIG, 'w') as f:
-            json.dump(tokens, f, indent=2)
+        _write_config_json(TOKENS_CONFIG, tokens)
 
     def _save_pairs(self, pairs: List[str]):
         os.makedirs(self.config_dir, exist_ok=True)
-        with open(PAIRS_CONFIG, 'w') as f:
-            json.dump(pairs, f, indent=2)
+        _write_config_json(PAIRS_CONFIG, pairs)
 
     def _save_trading_rules(self, rules: Dict[str, Any]):
         os.makedirs(self.config_dir, exist_ok=True)
-        with open(TRADING_RULES_CONFIG, 'w') as f:
-            json.dump(rules, f, indent=2)
+        _write_config_json(TRADING_RULES_CONFIG, rules)
 
     def _save_user_profiles(self, profiles: Dict[str, Any]):
         os.makedirs(self.config_dir, exist_ok=True)
-        with open(USER_PROFILES_CONFIG, 'w') as f:
-            json.dump(profiles, f, indent=2)
+        _write_config_json(USER_PROFILES_CONFIG, profiles)
 
     def get_user_profile(self, risk_level: str) -> UserProfile:
         profile_data = self.user_profiles.get(risk_level.lower(), self.user_profiles["moderate"])
@@ -904,29 +1320,79 @@ class ConfigManager:
     def get_rule(self, rule_name: str, default: Any = None) -> Any:
         return self.trading_rules.get(rule_name, default)
 
+    @property
+    def trading_thresholds(self) -> TradingThresholds:
+        """Thresholds for the current trading_rules; rebuilt only when the dict is replaced."""
+        cached = self._thresholds
+        if cached is None or cached[0] is not self.trading_rules:
+            cached = self._thresholds = (self.trading_rules, TradingThresholds.from_rules(self.trading_rules))
+        return cached[1]
+
 # --- MARKET DATA CLIENT ---
 
+_market_logger = logging.getLogger("market_data")
+
 class MarketDataClient:
     """Fetch real market data from Binance with robust symbol discovery and retry logic."""
     
     def __init__(self, timeout: int = MARKET_DATA_TIMEOUT):
         self.binance_api = BINANCE_API
+        self._breaker = _breaker_for(self.binance_api)
         self.binance_exchange_info_url = "https://api.binance.com/api/v3/exchangeInfo"
         self.timeout = timeout
-        self.symbol_cache = {}
-        self.cache_timestamps = {}
+        self.symbol_cache: Dict[str, Tuple[str, int]] = {}  # pair -> (symbol, discovered at)
+        self._discoveries = 0  # cache misses since start; drives the periodic sweep
+        self.sweep_every = 256
         self.cache_ttl = 3600  # 1 hour cache
         self.max_retries = 3
-        self.retry_delay = 1  # seconds
+        self.retry_delay_base = 1.0  # seconds; full-jitter backoff base
+        self.retry_delay_cap = 8.0  # seconds; upper bound on any single backoff
         self.available_symbols = None  # Lazy-loaded once
+        self._avail_set = frozenset()  # available_symbols, for O(1) exact lookups
+        self._avail_by_prefix: Dict[str, List[str]] = {}  # every prefix -> symbols starting with it
+        self._bad_symbols = set()  # symbols Binance rejected; never chosen again
+        # Depth is fetched on a worker while the ticker request runs on the caller's thread
+        self._fetch_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="market-data")
+        # Short-lived response cache: url -> (monotonic fetch time, parsed JSON)
+        self._resp_cache: Dict[str, Tuple[float, Any]] = {}
+        self.ticker_ttl = 5.0  # seconds
+        self.depth_ttl = 2.0  # seconds
+
+    def _cached_symbol(self, pair: str) -> Optional[str]:
+        """Return the discovered symbol for pair if it is still within cache_ttl."""
+        entry = self.symbol_cache.get(pair)
+        if entry is not None and _utc_unix() - entry[1] < self.cache_ttl:
+            return entry[0]
+        return None
 
-    def _is_cache_valid(self, pair: str) -> bool:
-        """Check if cached symbol is still valid."""
-        if pair not in self.symbol_cache:
-            return False
-        
-        timestamp = self.cache_timestamps.get(pair, 0)
-        return (_utc_unix() - timestamp) < self.cache_ttl
+    def _sweep_symbol_cache(self):
+        """Drop expired pair -> symbol entries so the cache doesn't grow with every pair ever seen."""
+        now = _utc_unix()
+        self.symbol_cache = {k: v for k, v in self.symbol_cache.items() if now - v[1] < self.cache_ttl}
+
+    def _cached_response(self, url: str, ttl: float) -> Optional[Any]:
+        """Return a cached Binance response if it is younger than ttl seconds."""
+        entry = self._resp_cache.get(url)
+        if entry is not None and time.monotonic() - entry[0] < ttl:
+            return entry[1]
+        return None
+
+    def _store_response(self, url: str, data: Any, version_key: str):
+        """Cache a response unless the cached one is newer (by Binance's closeTime / lastUpdateId)."""
+        entry = self._resp_cache.get(url)
+        if entry is not None and entry[1].get(version_key, 0) > data.get(version_key, 0):
+            return
+        self._resp_cache[url] = (time.monotonic(), data)
+
+    def _backoff(self, attempt: int) -> float:
+        """Full-jitter exponential backoff so concurrent callers don't retry in lockstep."""
+        return random.uniform(0, min(self.retry_delay_cap, self.retry_delay_base * (2 ** attempt)))
+
+    def _ticker_url(self, symbol: str) -> str:
+        return f"{self.binance_api}/ticker/24hr?symbol={symbol}"
+
+    def _depth_url(self, symbol: str) -> str:
+        return f"{self.binance_api}/depth?symbol={symbol}&limit=10"
 
     def _load_exchange_symbols(self) -> List[str]:
         """Load all valid trading pairs from Binance once."""
@@ -934,10 +1400,10 @@ class MarketDataClient:
             return self.available_symbols
         
         try:
-            print("[BINANCE] Fetching exchange info...")
-            resp = requests.get(self.binance_exchange_info_url, timeout=self.timeout)
+            _market_logger.debug("Fetching Binance exchange info")
+            resp = _SESSION.get(self.binance_exchange_info_url, timeout=self.timeout)
             resp.raise_for_status()
-            data = resp.json()
+            data = _resp_json(resp)
             
             symbols = []
             for symbol_obj in data.get("symbols", []):
@@ -945,18 +1411,29 @@ class MarketDataClient:
                     symbols.append(symbol_obj.get("symbol"))
             
             self.available_symbols = symbols
-            print(f"[BINANCE] Loaded {len(symbols)} trading pairs")
+            self._avail_set = frozenset(symbols)
+            by_prefix = defaultdict(list)
+            for s in symbols:
+                for i in range(1, len(s) + 1):
+                    by_prefix[s[:i]].append(s)
+            self._avail_by_prefix = dict(by_prefix)
+            _market_logger.debug("Loaded %d Binance trading pairs", len(symbols))
             return symbols
         except Exception as e:
-            print(f"[WARN] Failed to load exchange info: {e}")
+            _market_logger.warning("Failed to load exchange info: %s", e)
             return []
 
     def _discover_trading_pair(self, pair: str) -> str:
         """Robustly discover correct Binance symbol for a trading pair."""
         
         # Check cache first
-        if self._is_cache_valid(pair):
-            return self.symbol_cache[pair]
+        cached = self._cached_symbol(pair)
+        if cached is not None:
+            return cached
+        
+        self._discoveries += 1
+        if self._discoveries % self.sweep_every == 0:
+            self._sweep_symbol_cache()
         
         base, quote = pair.split("/") if "/" in pair else (pair[:3], pair[3:])
         base = base.upper()
@@ -971,157 +1448,275 @@ class MarketDataClient:
         candidates = []
         
         # Priority 1: Exact quote match
-        for symbol in available:
-            if symbol.startswith(base):
-                quote_part = symbol[len(base):]
-                if quote_part == quote:
-                    candidates.append((symbol, 100))  # Highest priority
+        if base + quote in self._avail_set:
+            candidates.append((base + quote, 100))  # Highest priority
         
         # Priority 2: USDT fallback (very common)
-        if quote == "USD":
-            for symbol in available:
-                if symbol == f"{base}USDT":
-                    candidates.append((symbol, 90))
-        
-        # Priority 3: Partial matches
-        for symbol in available:
-            if symbol.startswith(base) and quote in symbol:
+        if quote == "USD" and f"{base}USDT" in self._avail_set:
+            candidates.append((f"{base}USDT", 90))
+        
+        # Priority 3: Partial matches (only symbols sharing the base prefix)
+        for symbol in self._avail_by_prefix.get(base, ()):
+            if quote in symbol:
                 candidates.append((symbol, 50))
         
         if not candidates:
             raise Exception(f"[FAIL] No Binance symbol found for {pair}. Available bases: {[s[:5] for s in available[:20]]}")
         
-        # Sort by priority and verify with quick request
+        # Sort by priority; being listed as TRADING in exchangeInfo is the verification.
+        # get_market_data blacklists a symbol if Binance rejects it, and rediscovers.
         candidates.sort(key=lambda x: x[1], reverse=True)
         
         for symbol, priority in candidates:
-            try:
-                # Quick verification
-                test_url = f"{self.binance_api}/ticker/price?symbol={symbol}"
-                resp = requests.get(test_url, timeout=3)
-                if resp.status_code == 200:
-                    self.symbol_cache[pair] = symbol
-                    self.cache_timestamps[pair] = _utc_unix()
-                    print(f"[DISCOVER] {pair} → {symbol}")
-                    return symbol
-            except:
+            if symbol in self._bad_symbols:
                 continue
+            self.symbol_cache[pair] = (symbol, _utc_unix())
+            print(f"[DISCOVER] {pair} → {symbol}")
+            return symbol
         
         raise Exception(f"[FAIL] All candidate symbols failed for {pair}: {[s[0] for s in candidates[:3]]}")
 
+    def _parse_market_data(self, pair: str, ticker_data: Dict[str, Any], depth_data: Dict[str, Any]) -> MarketData:
+        """Derive MarketData from a 24hr ticker and a top-10 depth snapshot."""
+        current_price = float(ticker_data.get("lastPrice", 0))
+        if current_price <= 0:
+            raise Exception(f"Invalid price for {pair}")
+
+        # Better liquidity calculation from orderbook
+        bids = depth_data.get("bids", [])
+        asks = depth_data.get("asks", [])
+
+        bid = float(bids[0][0]) if bids else current_price
+        ask = float(asks[0][0]) if asks else current_price
+
+        # Liquidity: sum of top 10 bid/ask volumes
+        bid_volume = math.fsum([float(b[1]) for b in bids])
+        ask_volume = math.fsum([float(a[1]) for a in asks])
+        total_orderbook_volume = bid_volume + ask_volume
+
+        high_price = float(ticker_data.get("highPrice", current_price))
+        low_price = float(ticker_data.get("lowPrice", current_price))
+
+        if high_price <= 0 or low_price <= 0:
+            raise Exception(f"Invalid high/low for {pair}")
+
+        # More realistic volatility
+        volatility = ((high_price - low_price) / current_price * 100)
+
+        # Volume in quote currency
+        volume_24h = float(ticker_data.get("quoteAssetVolume", 0))
+        price_change = float(ticker_data.get("priceChangePercent", 0))
+
+        # RSI approximation
+        rsi = 50 + (price_change / 10)
+        rsi = max(0, min(100, rsi))
+
+        trend = "bullish" if price_change > 1 else "bearish" if price_change < -1 else "neutral"
+
+        bid_ask_spread = ((ask - bid) / current_price * 100) if current_price > 0 else 0.01
+
+        # Better liquidity score: based on orderbook depth and 24h volume
+        volume_score = min(100, (volume_24h / 10000000) * 50)  # Calibrated for realistic volumes
+        depth_score = min(100, (total_orderbook_volume / 100) * 50)
+        liquidity_score = (volume_score + depth_score) / 2
+
+        return MarketData(
+            pair=pair,
+            current_price=current_price,
+            volatility=volatility,
+            volume_24h=volume_24h,
+            trend=trend,
+            atr=volatility * 0.5,
+            rsi=rsi,
+            bid_ask_spread=bid_ask_spread,
+            liquidity_score=liquidity_score
+        )
+
     def get_market_data(self, pair: str) -> MarketData:
         """Fetch real market data with retry logic and rate limit handling."""
         
         symbol = self._discover_trading_pair(pair)
+        ticker_url = self._ticker_url(symbol)
+        depth_url = self._depth_url(symbol)
         
         # Retry logic for network issues
         for attempt in range(self.max_retries):
             try:
-                # Fetch ticker
-                ticker_url = f"{self.binance_api}/ticker/24hr?symbol={symbol}"
-                ticker_resp = requests.get(ticker_url, timeout=self.timeout)
-                
-                if ticker_resp.status_code == 429:  # Rate limited
-                    print(f"[RATE-LIMIT] Attempt {attempt + 1}, waiting {self.retry_delay}s...")
-                    import time
-                    time.sleep(self.retry_delay)
-                    continue
-                
-                ticker_resp.raise_for_status()
-                ticker_data = ticker_resp.json()
-                
-                if "code" in ticker_data and ticker_data["code"] != 0:
-                    raise Exception(f"Binance API error: {ticker_data.get('msg', 'Unknown')}")
-                
-                # Fetch orderbook
-                depth_url = f"{self.binance_api}/depth?symbol={symbol}&limit=10"
-                depth_resp = requests.get(depth_url, timeout=self.timeout)
-                depth_resp.raise_for_status()
-                depth_data = depth_resp.json()
-                
-                # Parse data
-                current_price = float(ticker_data.get("lastPrice", 0))
-                if current_price <= 0:
-                    raise Exception(f"Invalid price for {pair}")
-                
-                # Better liquidity calculation from orderbook
-                bids = depth_data.get("bids", [])
-                asks = depth_data.get("asks", [])
-                
-                bid = float(bids[0][0]) if bids else current_price
-                ask = float(asks[0][0]) if asks else current_price
-                
-                # Liquidity: sum of top 10 bid/ask volumes
-                bid_volume = sum([float(b[1]) for b in bids])
-                ask_volume = sum([float(a[1]) for a in asks])
-                total_orderbook_volume = bid_volume + ask_volume
+                # Reuse very recent responses; fetch whatever is missing, ticker and orderbook concurrently
+                ticker_data = self._cached_response(ticker_url, self.ticker_ttl)
+                depth_data = self._cached_response(depth_url, self.depth_ttl)
+                depth_future = None
+                if ticker_data is None or depth_data is None:
+                    self._breaker.before_call()  # fail fast while Binance is down
+                if depth_data is None:
+                    depth_future = self._fetch_pool.submit(_SESSION.get, depth_url, timeout=self.timeout)
                 
-                high_price = float(ticker_data.get("highPrice", current_price))
-                low_price = float(ticker_data.get("lowPrice", current_price))
-                
-                if high_price <= 0 or low_price <= 0:
-                    raise Exception(f"Invalid high/low for {pair}")
-                
-                # More realistic volatility
-                volatility = ((high_price - low_price) / current_price * 100)
-                
-                # Volume in quote currency
-                volume_24h = float(ticker_data.get("quoteAssetVolume", 0))
-                price_change = float(ticker_data.get("priceChangePercent", 0))
-                
-                # RSI approximation
-                rsi = 50 + (price_change / 10)
-                rsi = max(0, min(100, rsi))
-                
-                trend = "bullish" if price_change > 1 else "bearish" if price_change < -1 else "neutral"
-                
-                bid_ask_spread = ((ask - bid) / current_price * 100) if current_price > 0 else 0.01
+                if ticker_data is None:
+                    ticker_resp = _SESSION.get(ticker_url, timeout=self.timeout)
+                    
+                    if ticker_resp.status_code == 400:  # Symbol rejected - blacklist it and rediscover
+                        print(f"[DISCOVER] {symbol} rejected by Binance, rediscovering {pair}")
+                        self._bad_symbols.add(symbol)
+                        self.symbol_cache.pop(pair, None)
+                        symbol = self._discover_trading_pair(pair)
+                        ticker_url = self._ticker_url(symbol)
+                        depth_url = self._depth_url(symbol)
+                        continue
+                    
+                    if ticker_resp.status_code == 429:  # Rate limited
+                        # Honour Binance's Retry-After when given, else back off with jitter
+                        try:
+                            delay = float(ticker_resp.headers.get("Retry-After"))
+                            if math.isnan(delay):
+                                raise ValueError("NaN Retry-After")
+                        except (TypeError, ValueError):
+                            delay = self._backoff(attempt)
+                        if delay > self.retry_delay_cap:
+                            # Too long to block this thread: let the breaker fail callers fast until then
+                            self._breaker.trip(delay)
+                            raise CircuitOpenError(f"[RATE-LIMIT] Binance asked to wait {delay:.0f}s")
+                        print(f"[RATE-LIMIT] Attempt {attempt + 1}, waiting {delay:.2f}s...")
+                        time.sleep(max(0.0, delay))
+                        continue
+                    
+                    ticker_resp.raise_for_status()
+                    ticker_data = _resp_json(ticker_resp)
+                    
+                    if "code" in ticker_data and ticker_data["code"] != 0:
+                        raise Exception(f"Binance API error: {ticker_data.get('msg', 'Unknown')}")
                 
-                # Better liquidity score: based on orderbook depth and 24h volume
-                volume_score = min(100, (volume_24h / 10000000) * 50)  # Calibrated for realistic volumes
-                depth_score = min(100, (total_orderbook_volume / 100) * 50)
-                liquidity_score = (volume_score + depth_score) / 2
+                if depth_future is not None:
+                    # Orderbook (already in flight)
+                    depth_resp = depth_future.result()
+                    depth_resp.raise_for_status()
+                    depth_data = _resp_json(depth_resp)
                 
-                return MarketData(
-                    pair=pair,
-                    current_price=current_price,
-                    volatility=volatility,
-                    volume_24h=volume_24h,
-                    trend=trend,
-                    atr=volatility * 0.5,
-                    rsi=rsi,
-                    bid_ask_spread=bid_ask_spread,
-                    liquidity_score=liquidity_score
-                )
+                market_data = self._parse_market_data(pair, ticker_data, depth_data)
+                self._breaker.record_success()
+                # Only responses that produced valid market data are cached
+                self._store_response(ticker_url, ticker_data, "closeTime")
+                self._store_response(depth_url, depth_data, "lastUpdateId")
+                return market_data
+            
+            except CircuitOpenError:
+                raise
             
             except requests.Timeout:
+                self._breaker.record_failure()
                 if attempt < self.max_retries - 1:
                     print(f"[RETRY] Timeout attempt {attempt + 1}/{self.max_retries}")
-                    import time
-                    time.sleep(self.retry_delay)
+                    time.sleep(self._backoff(attempt))
                     continue
                 raise Exception(f"[FAIL] Market data timeout after {self.max_retries} attempts")
             
             except requests.RequestException as e:
+                self._breaker.record_failure()
                 if attempt < self.max_retries - 1:
                     print(f"[RETRY] Request failed attempt {attempt + 1}/{self.max_retries}: {e}")
-                    import time
-                    time.sleep(self.retry_delay)
+                    time.sleep(self._backoff(attempt))
                     continue
                 raise Exception(f"[FAIL] Market data request failed: {e}")
             
             except Exception as e:
                 if attempt < self.max_retries - 1:
                     print(f"[RETRY] Error attempt {attempt + 1}/{self.max_retries}: {e}")
-                    import time
-                    time.sleep(self.retry_delay)
+                    time.sleep(self._backoff(attempt))
                     continue
                 raise
         
         raise Exception(f"[FAIL] All retry attempts exhausted for {pair}")
 
+    def get_market_data_batch(self, pairs: List[str]) -> Dict[str, Union[MarketData, Exception]]:
+        """Fetch several pairs with one /ticker/24hr?symbols=[...] request.
+
+        Orderbooks are still per symbol, fetched concurrently while the ticker batch is in
+        flight. Any pair the batch can't serve goes through get_market_data (and its retry
+        logic); pairs that still fail map to their exception instead of raising.
+        """
+        results: Dict[str, Union[MarketData, Exception]] = {}
+        symbols: Dict[str, str] = {}
+        for pair in pairs:
+            try:
+                symbols[pair] = self._discover_trading_pair(pair)
+            except Exception as e:
+                results[pair] = e
+
+        tickers: Dict[str, Any] = {}
+        depths: Dict[str, Any] = {}
+        missing = []
+        for symbol in dict.fromkeys(symbols.values()):
+            ticker = self._cached_response(self._ticker_url(symbol), self.ticker_ttl)
+            if ticker is None:
+                missing.append(symbol)
+            else:
+                tickers[symbol] = ticker
+
+        if len(missing) > 1:
+            try:
+                self._breaker.before_call()
+                depth_futures = {}
+                for symbol in dict.fromkeys(symbols.values()):
+                    depth_url = self._depth_url(symbol)
+                    depth = self._cached_response(depth_url, self.depth_ttl)
+                    if depth is None:
+                        depth_futures[symbol] = self._fetch_pool.submit(_SESSION.get, depth_url, timeout=self.timeout)
+                    else:
+                        depths[symbol] = depth
+                batch_url = f"{self.binance_api}/ticker/24hr?symbols=" + urllib.parse.quote(
+                    json.dumps(missing, separators=(",", ":"))
+                )
+                resp = _SESSION.get(batch_url, timeout=self.timeout)
+                resp.raise_for_status()
+                for ticker in _resp_json(resp):
+                    tickers[ticker["symbol"]] = ticker
+                for symbol, future in depth_futures.items():
+                    try:
+                        depth_resp = future.result()
+                        depth_resp.raise_for_status()
+                        depths[symbol] = _resp_json(depth_resp)
+                    except Exception as e:
+                        _market_logger.debug("Batch depth fetch failed for %s: %s", symbol, e)
+                self._breaker.record_success()
+            except CircuitOpenError:
+                pass  # get_market_data below fails fast with the same error
+            except Exception as e:
+                if isinstance(e, requests.RequestException):
+                    self._breaker.record_failure()
+                print(f"[BATCH] Ticker batch failed, fetching pairs one by one: {e}")
+
+        for pair, symbol in symbols.items():
+            ticker, depth = tickers.get(symbol), depths.get(symbol)
+            if ticker is not None and depth is not None:
+                try:
+                    results[pair] = self._parse_market_data(pair, ticker, depth)
+                    self._store_response(self._ticker_url(symbol), ticker, "closeTime")
+                    self._store_response(self._depth_url(symbol), depth, "lastUpdateId")
+                    continue
+                except Exception:
+                    pass  # let the single-pair path retry it
+            try:
+                results[pair] = self.get_market_data(pair)
+            except Exception as e:
+                results[pair] = e
+
+        return {pair: results[pair] for pair in pairs}
+
 # --- METTA KNOWLEDGE BASE ---
 
+@functools.lru_cache(maxsize=1024)
+def _metta_query_text(head: str, items: Tuple[Tuple[str, Any], ...]) -> str:
+    return f"({head} {' '.join([f'{k}={v}' for k, v in items])})"
+
+
+def _format_metta_query(head: str, params: Dict[str, Any]) -> str:
+    """Render "(head k=v ...)", memoized for hashable params since the same queries repeat in bursts."""
+    items = tuple(params.items())
+    try:
+        return _metta_query_text(head, items)
+    except TypeError:
+        return _metta_query_text.__wrapped__(head, items)
+
+
 class MeTTaKnowledgeBase:
     def __init__(self, storage_dir: str = METTA_STORAGE_DIR):
         self.storage_dir = storage_dir
@@ -1134,15 +1729,116 @@ class MeTTaKnowledgeBase:
                 print("[METTA] Hyperon runner initialized")
             except Exception as e:
                 print(f"[METTA] Failed to init Hyperon runner: {e}")
-        
+
+        # (kind, name, sorted params) -> (monotonic ts, result); dict order doubles as LRU order
+        self._query_cache: Dict[Tuple, Tuple[float, Any]] = {}
+        self.query_cache_size = 1024
+        self.rule_ttl = 30.0  # seconds
+        self.recommendation_ttl = 300.0  # seconds
+        # (id(rules), profile fields, pairs) -> (rules, summary), LRU via dict order
+        self._ctx_cache: Dict[Tuple, Tuple[Dict[str, Any], str]] = {}
+        self.ctx_cache_size = 64
+
+        self._metta_proc: Optional[subprocess.Popen] = None
+        self._metta_out: "queue.Queue[str]" = queue.Queue()
+        self._metta_lock = threading.Lock()
+        self._metta_seq = 0
+
         self._initialize_storage()
         self._load_default_knowledge_base()
+        if METTA_REPL and self.enabled and not self._metta and not self.use_remote:
+            self._start_metta_repl()
+
+    def _start_metta_repl(self):
+        """Spawn a persistent `metta -i` process; stdout is pumped into a queue by a daemon thread."""
+        try:
+            self._metta_proc = subprocess.Popen(
+                [METTA_EXEC_PATH, "-i"],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                text=True,
+                bufsize=1,
+                cwd=self.storage_dir,
+            )
+        except Exception as e:
+            print(f"[METTA] Failed to start REPL, using one-shot CLI: {e}")
+            self._metta_proc = None
+            return
+        threading.Thread(target=self._pump_metta_stdout, args=(self._metta_proc,), daemon=True).start()
+        atexit.register(self._stop_metta_repl)
+        print("[METTA] REPL process started")
+
+    def _pump_metta_stdout(self, proc: subprocess.Popen):
+        for line in proc.stdout:
+            self._metta_out.put(line)
+
+    def _stop_metta_repl(self):
+        proc, self._metta_proc = self._metta_proc, None
+        if proc is not None and proc.poll() is None:
+            proc.terminate()
+
+    def _metta_send(self, query: str, timeout: float = 5) -> str:
+        """Send one query to the REPL and return everything it printed for that query.
+
+        The query is bracketed by numbered println! sentinels, so banners, prompts and late
+        output from earlier queries are skipped, and multi-line answers are read in full.
+        Raises TimeoutError if the closing sentinel doesn't arrive in time.
+        """
+        with self._metta_lock:
+            self._metta_seq += 1
+            begin, end = f"__BEGIN_{self._metta_seq}__", f"__END_{self._metta_seq}__"
+            self._metta_proc.stdin.write(f'!(println! "{begin}")\n{query}\n!(println! "{end}")\n')
+            self._metta_proc.stdin.flush()
+
+            deadline = time.monotonic() + timeout
+            lines: List[str] = []
+            started = False
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise TimeoutError(f"no {end} sentinel from MeTTa REPL within {timeout}s")
+                try:
+                    line = self._metta_out.get(timeout=remaining)
+                except queue.Empty:
+                    continue
+                if not started:
+                    started = begin in line
+                    # println! itself evaluates to unit, which the REPL echoes right after the marker
+                    skip_unit = started
+                elif end in line:
+                    return "".join(lines)
+                elif skip_unit and line.strip() == "[()]":
+                    skip_unit = False
+                else:
+                    skip_unit = False
+                    lines.append(line)
+
+    def _run_metta_cli(self, query: str) -> Tuple[bool, str]:
+        """Evaluate a query with the MeTTa CLI; returns (ok, stdout)."""
+        if self._metta_proc is not None:
+            try:
+                return True, self._metta_send(query)
+            except Exception as e:
+                # A hung or dead REPL can't be resynced safely; drop it for good
+                print(f"[METTA] REPL query failed, falling back to one-shot CLI: {e}")
+                self._stop_metta_repl()
+
+        result = subprocess.run(
+            [METTA_EXEC_PATH, "-c", query],
+            capture_output=True,
+            text=True,
+            timeout=5,
+            cwd=self.storage_dir
+        )
+        return result.returncode == 0, result.stdout
 
     def _initialize_storage(self):
         if not os.path.exists(self.storage_dir):
             os.makedirs(self.storage_dir)
 
     def _load_default_knowledge_base(self):
+        self._query_cache.clear()
         kb_file = os.path.join(self.storage_dir, "trading_rules.metta")
         
         if not os.path.exists(kb_file):
@@ -1181,73 +1877,96 @@ class MeTTaKnowledgeBase:
 
     def validate_strategy(self, strategy: Strategy, market_data: MarketData, config: ConfigManager) -> Tuple[bool, List[str]]:
         errors = []
-        rules = config.trading_rules
+        limits = config.trading_thresholds
+        entry = strategy.entry_price
         
-        if strategy.stop_loss >= strategy.entry_price:
-            errors.append(f"Stop loss must be < entry price")
+        if strategy.stop_loss >= entry:
+            errors.append("Stop loss must be < entry price")
         
-        if strategy.take_profit <= strategy.entry_price:
-            errors.append(f"Take profit must be > entry price")
+        if strategy.take_profit <= entry:
+            errors.append("Take profit must be > entry price")
         
-        potential_loss = strategy.entry_price - strategy.stop_loss
-        potential_gain = strategy.take_profit - strategy.entry_price
+        potential_loss = entry - strategy.stop_loss
         if potential_loss > 0:
-            rr_ratio = potential_gain / potential_loss
-            min_rr = rules.get("min_rr_ratio", 1.5)
-            if rr_ratio < min_rr:
-                errors.append(f"RR ratio ({rr_ratio:.2f}) < minimum ({min_rr})")
+            rr_ratio = (strategy.take_profit - entry) / potential_loss
+            if rr_ratio < limits.min_rr_ratio:
+                errors.append(f"RR ratio ({rr_ratio:.2f}) < minimum ({limits.min_rr_ratio})")
         
-        max_size = rules.get("max_position_size", 100000)
-        if strategy.position_size > max_size:
-            errors.append(f"Position size exceeds maximum")
+        if strategy.position_size > limits.max_position_size:
+            errors.append("Position size exceeds maximum")
         
-        min_conf = rules.get("min_confidence", 0.6)
-        if strategy.confidence < min_conf:
-            errors.append(f"Confidence too low")
+        if strategy.confidence < limits.min_confidence:
+            errors.append("Confidence too low")
         
-        min_liq = rules.get("min_liquidity_score", 60.0)
-        if market_data.liquidity_score < min_liq:
-            errors.append(f"Liquidity insufficient")
+        if market_data.liquidity_score < limits.min_liquidity_score:
+            errors.append("Liquidity insufficient")
         
         return len(errors) == 0, errors
 
+    def _cached_query(self, key: Optional[Tuple], ttl: float) -> Tuple[bool, Any]:
+        """Return (hit, result) from the query LRU, refreshing the entry's recency on a hit."""
+        if key is None:
+            return False, None
+        entry = self._query_cache.pop(key, None)
+        if entry is None or time.monotonic() - entry[0] >= ttl:
+            return False, None
+        self._query_cache[key] = entry
+        return True, entry[1]
+
+    def _store_query(self, key: Optional[Tuple], result: Any):
+        if key is None:
+            return
+        self._query_cache[key] = (time.monotonic(), result)
+        if len(self._query_cache) > self.query_cache_size:
+            del self._query_cache[next(iter(self._query_cache))]
+
+    @staticmethod
+    def _query_key(kind: str, name: str, params: Dict[str, Any]) -> Optional[Tuple]:
+        """Hashable cache key for a query, or None if params hold unhashable values."""
+        key = (kind, name, tuple(sorted(params.items())))
+        try:
+            hash(key)
+        except TypeError:
+            return None
+        return key
+
     def query_rule(self, rule_name: str, params: Dict[str, Any]) -> bool:
-        """Query MeTTa for rule evaluation."""
+        """Query MeTTa for rule evaluation (memoized for rule_ttl seconds)."""
+        key = self._query_key("rule", rule_name, params)
+        hit, result = self._cached_query(key, self.rule_ttl)
+        if hit:
+            return result
         # Choose backend: remote KG (e.g. SingularityNET) or local CLI
         if self.use_remote:
-            return self._query_rule_remote(rule_name, params)
+            ok, result = self._query_rule_remote(rule_name, params)
         else:
-            return self._query_rule_local(rule_name, params)
-
-    def _query_rule_local(self, rule_name: str, params: Dict[str, Any]) -> bool:
-        """Evaluate rule using local MeTTa CLI or Hyperon library."""
+            ok, result = self._query_rule_local(rule_name, params)
+        # Fail-open fallbacks are not cached, so a transient backend error isn't pinned for rule_ttl
+        if ok:
+            self._store_query(key, result)
+        return result
+
+    def _query_rule_local(self, rule_name: str, params: Dict[str, Any]) -> Tuple[bool, bool]:
+        """Evaluate rule using local MeTTa CLI or Hyperon library; returns (evaluated, passed)."""
         try:
-            param_str = " ".join([f"{k}={v}" for k, v in params.items()])
-            query = f"({rule_name} {param_str})"
+            query = _format_metta_query(rule_name, params)
 
             # Use Hyperon library if available (Windows native support)
             if self._metta:
                 results = self._metta.run(f"!{query}")
                 # Check if any result is true/success
                 # Hyperon returns a list of results. We check string representation.
-                return any("True" in str(r) or "success" in str(r) for r in results)
+                return True, any("True" in str(r) or "success" in str(r) for r in results)
 
             # Fallback to CLI (WSL/Linux)
-            result = subprocess.run(
-                [METTA_EXEC_PATH, "-c", query],
-                capture_output=True,
-                text=True,
-                timeout=5,
-                cwd=self.storage_dir
-            )
-
-            return result.returncode == 0 and ("true" in result.stdout.lower() or "success" in result.stdout.lower())
+            ok, stdout = self._run_metta_cli(query)
+            return ok, ok and ("true" in stdout.lower() or "success" in stdout.lower())
         except Exception as e:
             print(f"[METTA] Rule query failed (local): {e}")
-            return True
+            return False, True
 
-    def _query_rule_remote(self, rule_name: str, params: Dict[str, Any]) -> bool:
-        """Evaluate rule using a remote MeTTa / knowledge-graph service."""
+    def _query_rule_remote(self, rule_name: str, params: Dict[str, Any]) -> Tuple[bool, bool]:
+        """Evaluate rule using a remote MeTTa / knowledge-graph service; returns (evaluated, passed)."""
         if not REMOTE_METTA_ENDPOINT:
             return self._query_rule_local(rule_name, params)
 
@@ -1262,63 +1981,63 @@ class MeTTaKnowledgeBase:
             if REMOTE_METTA_API_KEY:
                 headers["Authorization"] = f"Bearer {REMOTE_METTA_API_KEY}"
 
-            resp = requests.post(
+            resp = _SESSION.post(
                 REMOTE_METTA_ENDPOINT.rstrip("/") + "/query_rule",
-                json=payload,
+                data=_json_body(payload),
                 headers=headers,
                 timeout=10,
             )
             resp.raise_for_status()
-            data = resp.json()
-            return bool(data.get("result", True))
+            data = _resp_json(resp)
+            return True, bool(data.get("result", True))
         except Exception as e:
             print(f"[METTA] Rule query failed (remote): {e}")
-            return True
+            return False, True
 
     def get_strategy_recommendation(self, market_conditions: Dict[str, float]) -> Optional[str]:
-        """Query MeTTa for strategy recommendation based on market conditions."""
+        """Query MeTTa for strategy recommendation based on market conditions (memoized for recommendation_ttl seconds)."""
+        key = self._query_key("recommendation", "recommended-strategy", market_conditions)
+        hit, result = self._cached_query(key, self.recommendation_ttl)
+        if hit:
+            return result
         if self.use_remote:
-            return self._get_strategy_recommendation_remote(market_conditions)
+            ok, result = self._get_strategy_recommendation_remote(market_conditions)
         else:
-            return self._get_strategy_recommendation_local(market_conditions)
+            ok, result = self._get_strategy_recommendation_local(market_conditions)
+        if ok:
+            self._store_query(key, result)
+        return result
 
-    def _get_strategy_recommendation_local(self, market_conditions: Dict[str, float]) -> Optional[str]:
-        """Get strategy recommendation via local MeTTa CLI or Hyperon."""
+    def _get_strategy_recommendation_local(self, market_conditions: Dict[str, float]) -> Tuple[bool, Optional[str]]:
+        """Get strategy recommendation via local MeTTa CLI or Hyperon; returns (evaluated, strategy)."""
         try:
-            conditions_str = " ".join([f"{k}={v}" for k, v in market_conditions.items()])
-            query = f"(recommended-strategy {conditions_str})"
+            query = _format_metta_query("recommended-strategy", market_conditions)
 
             # Use Hyperon library if available
             if self._metta:
                 results = self._metta.run(f"!{query}")
-                output = str(results).lower()
+                ok, output = True, str(results).lower()
             else:
                 # Fallback to CLI
-                result = subprocess.run(
-                    [METTA_EXEC_PATH, "-c", query],
-                    capture_output=True,
-                    text=True,
-                    timeout=5,
-                    cwd=self.storage_dir
-                )
-                output = result.stdout.strip().lower() if result.returncode == 0 and result.stdout else ""
+                ok, stdout = self._run_metta_cli(query)
+                output = stdout.strip().lower() if ok and stdout else ""
 
             if "mean-reversion" in output or "mean_reversion" in output:
-                return "mean_reversion"
+                return ok, "mean_reversion"
             elif "momentum" in output:
-                return "momentum"
+                return ok, "momentum"
             elif "grid" in output:
-                return "grid"
+                return ok, "grid"
             elif "dca" in output:
-                return "dca"
+                return ok, "dca"
 
-            return None
+            return ok, None
         except Exception as e:
             print(f"[METTA] Strategy recommendation failed (local): {e}")
-            return None
+            return False, None
 
-    def _get_strategy_recommendation_remote(self, market_conditions: Dict[str, float]) -> Optional[str]:
-        """Get strategy recommendation from a remote MeTTa / KG service.
+    def _get_strategy_recommendation_remote(self, market_conditions: Dict[str, float]) -> Tuple[bool, Optional[str]]:
+        """Get strategy recommendation from a remote MeTTa / KG service; returns (evaluated, strategy).
 
         This is a generic HTTP client that can be pointed to SingularityNET or
         another MeTTa-based service. Adjust the endpoint and response parsing to
@@ -1337,27 +2056,46 @@ class MeTTaKnowledgeBase:
             if REMOTE_METTA_API_KEY:
                 headers["Authorization"] = f"Bearer {REMOTE_METTA_API_KEY}"
 
-            resp = requests.post(
+            resp = _SESSION.post(
                 REMOTE_METTA_ENDPOINT.rstrip("/") + "/recommend_strategy",
-                json=payload,
+                data=_json_body(payload),
                 headers=headers,
                 timeout=10,
             )
             resp.raise_for_status()
-            data = resp.json()
-            return data.get("strategy")
+            data = _resp_json(resp)
+            return True, data.get("strategy")
         except Exception as e:
             print(f"[METTA] Strategy recommendation failed (remote): {e}")
-            return None
+            return False, None
 
     def build_context_summary(self, config: "ConfigManager", user_profile: "UserProfile") -> str:
         """Build a concise symbolic-style summary of trading rules and user profile for LLM prompts.
 
         This does not call the MeTTa binary; instead, it serializes the key constraints and
         preferences that MeTTa/Python rules are expected to enforce so the LLM can reason
-        with them explicitly as part of its context.
+        with them explicitly as part of its context. The result is memoized per rules dict,
+        profile values and leading config pairs, since those rarely change between prompts.
         """
         rules = config.trading_rules
+        try:
+            key = (
+                id(rules),
+                user_profile.risk_tolerance,
+                user_profile.max_position_size,
+                user_profile.max_daily_loss,
+                user_profile.max_leverage,
+                user_profile.max_portfolio_allocation,
+                tuple(sorted(user_profile.preferred_pairs)),
+                tuple(config.pairs[:5]),
+            )
+            cached = self._ctx_cache.pop(key, None)
+        except Exception:
+            key, cached = None, None
+        if cached is not None and cached[0] is rules:
+            self._ctx_cache[key] = cached
+            return cached[1]
+
         parts = []
 
         parts.append(
@@ -1393,11 +2131,16 @@ class MeTTaKnowledgeBase:
         except Exception:
             pass
 
-        return "; ".join(parts)
+        summary = "; ".join(parts)
+        if key is not None:
+            self._ctx_cache[key] = (rules, summary)
+            if len(self._ctx_cache) > self.ctx_cache_size:
+                del self._ctx_cache[next(iter(self._ctx_cache))]
+        return summary
 
 # --- USER INTENT INTERPRETER ---
 
-@dataclass
+@dataclass(**_SLOTS)
 class InterpretedIntent:
     intent_type: str  # "trade", "config", "strategy", "query", "cancel"
     action: str  # "start", "stop", "configure", "explain"
@@ -1409,6 +2152,12 @@ class InterpretedIntent:
 class UserIntentInterpreter:
     """Interpret natural language user input into structured intents."""
     
+    # _extract_pair lookup tables, in match-priority order
+    _KNOWN_PAIRS = ("DAI/USDC", "ETH/USD", "BTC/USD", "SOL/USD", "AAVE/USD", "USDC/ETH", "ETH/USDC", "BTC/USDC", "ETH/BTC")
+    _COMPACT_PAIRS = tuple((p.replace("/", ""), p) for p in _KNOWN_PAIRS)
+    _KNOWN_TOKENS = ("ETH", "BTC", "SOL", "AAVE", "DAI", "USDC", "USDT")
+    _STRIP_PAIR_SEPARATORS = str.maketrans("", "", " /")
+    
     def __init__(self, llm_endpoint: str, llm_key: str, llm_model: str, 
                  cudos_client: Optional["CUDOSInferenceClient"] = None):
         self.llm_endpoint = llm_endpoint
@@ -1433,24 +2182,37 @@ class UserIntentInterpreter:
             except:
                 pass
         
+        breaker = _breaker_for(self.llm_endpoint)
         headers = {
             "Authorization": f"Bearer {self.llm_key}",
             "Content-Type": "application/json",
         }
         try:
-            resp = requests.post(
+            breaker.before_call()
+            resp = _SESSION.post(
                 self.llm_endpoint + "/chat/completions",
                 headers=headers,
-                json={
+                data=_json_body({
                     "model": self.llm_model,
                     "messages": messages,
                     "temperature": 0.3,
                     "max_tokens": 500,
-                },
+                }),
                 timeout=30
             )
-            data = resp.json()
+            if resp.status_code >= 500:
+                breaker.record_failure()
+            else:
+                breaker.record_success()
+            data = _resp_json(resp)
             return (data.get("choices") or [{}])[0].get("message", {}).get("content", "")
+        except CircuitOpenError as e:
+            print(f"[ERROR] LLM interpretation skipped: {e}")
+            return ""
+        except requests.RequestException as e:
+            breaker.record_failure()
+            print(f"[ERROR] LLM interpretation failed: {e}")
+            return ""
         except Exception as e:
             print(f"[ERROR] LLM interpretation failed: {e}")
             return ""
@@ -1492,7 +2254,7 @@ Output ONLY valid JSON, no other text."""
         output = self._call_llm(system_prompt, user_input)
         
         try:
-            intent_data = json.loads(output)
+            intent_data = _json_loads(output)
             return InterpretedIntent(
                 intent_type=intent_data.get("intent_type", "query"),
                 action=intent_data.get("action", "start"),
@@ -1546,17 +2308,15 @@ Output ONLY valid JSON, no other text."""
 
     def _extract_pair(self, text: str) -> Optional[str]:
         """Extract trading pair from text."""
-        pairs = ["DAI/USDC", "ETH/USD", "BTC/USD", "SOL/USD", "AAVE/USD", "USDC/ETH", "ETH/USDC", "BTC/USDC", "ETH/BTC"]
         text_upper = text.upper()
-        # Check for explicit pair format (e.g., "USDC/ETH" or "USDC ETH")
-        for pair in pairs:
-            if pair.replace("/", "") in text_upper.replace(" ", "").replace("/", ""):
-                return pair
-            if pair in text_upper:
+        # Check for explicit pair format (e.g., "USDC/ETH" or "USDC ETH"); separators are
+        # stripped once, which also covers the literal "USDC/ETH" spelling
+        compact = text_upper.translate(self._STRIP_PAIR_SEPARATORS)
+        for compact_pair, pair in self._COMPACT_PAIRS:
+            if compact_pair in compact:
                 return pair
         # Check for individual tokens and infer pair
-        tokens = ["ETH", "BTC", "SOL", "AAVE", "DAI", "USDC", "USDT"]
-        found = [t for t in tokens if t in text_upper]
+        found = [t for t in self._KNOWN_TOKENS if t in text_upper]
         if len(found) >= 2:
             return f"{found[0]}/{found[1]}"
         elif len(found) == 1:
@@ -1566,7 +2326,7 @@ Output ONLY valid JSON, no other text."""
 
 # --- TRADING EXECUTOR ---
 
-@dataclass
+@dataclass(**_SLOTS)
 class ExecutionResult:
     success: bool
     message: str
@@ -1779,41 +2539,42 @@ class TradingExecutor:
 
 # --- BACKTEST ENGINE ---
 
+# Root seed for the Monte Carlo engines. Each engine gets its own PCG64 Generator on an
+# independent spawned stream, so concurrent engines never share (or lock) one generator.
+_SEED_SEQ = np.random.SeedSequence()
+
+
+def _child_rng() -> np.random.Generator:
+    return np.random.default_rng(_SEED_SEQ.spawn(1)[0])
+
+
 class BacktestEngine:
+    def __init__(self, rng: Optional[np.random.Generator] = None):
+        self.rng = rng if rng is not None else _child_rng()
+
     def backtest_strategy(self, strategy: Strategy, pair: str, market_data: MarketData) -> BacktestResult:
         num_trades = 100
-        wins = 0
-        total_return = 0.0
-        max_loss = 0.0
-        trades = []
-        
-        for i in range(num_trades):
-            entry_slippage = np.random.normal(0, market_data.bid_ask_spread / 2)
-            entry_price = strategy.entry_price * (1 + entry_slippage / 100)
-            
-            outcome = np.random.choice(['tp', 'sl', 'neutral'], p=[0.6, 0.25, 0.15])
-            
-            if outcome == 'tp':
-                exit_price = strategy.take_profit
-                trade_return = ((exit_price - entry_price) / entry_price) * 100
-                wins += 1
-            elif outcome == 'sl':
-                exit_price = strategy.stop_loss
-                trade_return = ((exit_price - entry_price) / entry_price) * 100
-                max_loss = min(max_loss, trade_return)
-            else:
-                exit_price = entry_price * (1 + np.random.normal(0, market_data.volatility / 20))
-                trade_return = ((exit_price - entry_price) / entry_price) * 100
-                if trade_return > 0:
-                    wins += 1
-            
-            total_return += trade_return
-            trades.append(trade_return)
         
-        avg_return = total_return / num_trades
+        # All simulated trades at once: entry slippage, then take-profit / stop-loss / neutral exit
+        entry_slippage = self.rng.normal(0, market_data.bid_ask_spread / 2, num_trades)
+        entry_price = strategy.entry_price * (1 + entry_slippage / 100)
+        
+        outcome = self.rng.choice(3, size=num_trades, p=[0.6, 0.25, 0.15])  # 0=tp, 1=sl, 2=neutral
+        is_tp, is_sl, is_neutral = outcome == 0, outcome == 1, outcome == 2
+        
+        exit_price = np.where(is_tp, strategy.take_profit, strategy.stop_loss)
+        exit_price[is_neutral] = entry_price[is_neutral] * (
+            1 + self.rng.normal(0, market_data.volatility / 20, int(is_neutral.sum()))
+        )
+        trades = ((exit_price - entry_price) / entry_price) * 100
+        
+        wins = int(is_tp.sum() + (is_neutral & (trades > 0)).sum())
+        max_loss = float(trades[is_sl].min(initial=0.0))
+        
+        avg_return = float(trades.mean())
         win_rate = wins / num_trades
-        sharpe = avg_return / (np.std(trades) + 0.001)
-        profit_factor = sum([t for t in trades if t > 0]) / (abs(sum([t for t in trades if t < 0])) + 0.001)
+        sharpe = avg_return / (float(trades.std()) + 0.001)
+        profit_factor = float(trades[trades > 0].sum()) / (abs(float(trades[trades < 0].sum())) + 0.001)
         
         return BacktestResult(
             strategy_name=strategy.name,
@@ -1831,9 +2592,29 @@ class BacktestEngine:
 
 # --- RISK ENGINE ---
 
+_mc_drawdown_kernel = None
+if _NUMBA_AVAILABLE and RISK_JIT:
+    @_njit(parallel=True, fastmath=True, cache=True)
+    def _mc_drawdown_kernel(initial_price, volatility, iterations, steps):
+        """Per-path drawdown (%) of a multiplicative random walk; -1.0 marks paths whose peak is <= 0."""
+        out = np.empty(iterations)
+        sigma = volatility / 100.0
+        for i in _prange(iterations):
+            price = initial_price
+            peak = price
+            for _ in range(steps):
+                price *= 1.0 + np.random.normal(0.0, sigma)
+                if price > peak:
+                    peak = price
+            out[i] = (peak - price) / peak * 100.0 if peak > 0 else -1.0
+        return out
+
+    _mc_drawdown_kernel(100.0, 1.0, 8, 20)  # Compile once at import
+
 class RiskEngine:
-    def __init__(self, market_client: MarketDataClient):
+    def __init__(self, market_client: MarketDataClient, rng: Optional[np.random.Generator] = None):
         self.market_client = market_client
+        self.rng = rng if rng is not None else _child_rng()
 
     def assess_risk(self, strategy: Strategy, market_data: MarketData, config: ConfigManager) -> RiskMetrics:
         potential_loss = strategy.entry_price - strategy.stop_loss
@@ -1872,19 +2653,20 @@ class RiskEngine:
 
     def _monte_carlo_drawdown(self, entry: float, stop_loss: float, initial_price: float,
                              volatility: float, iterations: int = 1000) -> float:
-        max_prices = []
-        for _ in range(iterations):
-            price = initial_price
-            max_price = price
-            for _ in range(20):
-                change = np.random.normal(0, volatility / 100)
-                price *= (1 + change)
-                max_price = max(max_price, price)
-            
-            if max_price > 0:
-                max_prices.append((max_price - price) / max_price * 100)
+        if _mc_drawdown_kernel is not None:
+            drawdowns = _mc_drawdown_kernel(float(initial_price), float(volatility), iterations, 20)
+            drawdowns = drawdowns[drawdowns >= 0]
+            return float(np.percentile(drawdowns, 95)) if drawdowns.size else 5.0
+        
+        # One row per simulated 20-step price path
+        changes = self.rng.normal(0, volatility / 100, (iterations, 20))
+        paths = initial_price * np.cumprod(1 + changes, axis=1)
+        max_price = np.maximum(paths.max(axis=1), initial_price)
+        price = paths[:, -1]
         
-        return np.percentile(max_prices, 95) if max_prices else 5.0
+        valid = max_price > 0
+        drawdowns = (max_price[valid] - price[valid]) / max_price[valid] * 100
+        return float(np.percentile(drawdowns, 95)) if drawdowns.size else 5.0
 
     def _kelly_criterion(self, win_prob: float, rr_ratio: float) -> float:
         if rr_ratio == 0:
@@ -1914,14 +2696,14 @@ class CUDOSInferenceClient:
         }
         
         try:
-            resp = requests.post(
+            resp = _SESSION.post(
                 f"{self.cudos_endpoint}/chat/completions",
                 headers=self.headers,
-                json=payload,
+                data=_json_body(payload),
                 timeout=self.timeout
             )
             resp.raise_for_status()
-            return resp.json()
+            return _resp_json(resp)
         except Exception as e:
             raise Exception(f"CUDOS inference failed: {str(e)}")
 
@@ -1936,6 +2718,46 @@ class CUDOSInferenceClient:
 
 # --- AUTONOMOUS REASONING ENGINE ---
 
+# Numeric Strategy fields the refinement step may overwrite from the LLM's JSON
+_REFINABLE_FLOAT_FIELDS = ("entry_price", "exit_price", "stop_loss", "take_profit", "expected_return", "confidence")
+
+def _extract_json(text: str) -> Any:
+    """Parse an LLM reply as JSON, falling back to the first balanced {...} object inside it.
+
+    Models often wrap the object in prose or ``` fences; salvaging it avoids re-running the
+    whole reasoning step. Raises ValueError when no object in the text parses.
+    """
+    try:
+        return _json_loads(text)
+    except ValueError:
+        pass
+    start = text.find("{")
+    while start != -1:
+        depth, in_str, escaped = 0, False, False
+        for i in range(start, len(text)):
+            c = text[i]
+            if in_str:
+                if escaped:
+                    escaped = False
+                elif c == "\\":
+                    escaped = True
+                elif c == '"':
+                    in_str = False
+            elif c == '"':
+                in_str = True
+            elif c == "{":
+                depth += 1
+            elif c == "}":
+                depth -= 1
+                if depth == 0:
+                    try:
+                        return _json_loads(text[start:i + 1])
+                    except ValueError:
+                        break
+        start = text.find("{", start + 1)
+    raise ValueError("no JSON object found in LLM output")
+
+
 class AutonomousReasoningEngine:
     def __init__(self, llm_endpoint: str, llm_key: str, llm_model: str, 
                  metta_kb: MeTTaKnowledgeBase, config: ConfigManager,
@@ -1950,6 +2772,14 @@ class AutonomousReasoningEngine:
         self.market_client = MarketDataClient()
         self.risk_engine = RiskEngine(self.market_client)  # Pass market client
         self.backtest_engine = BacktestEngine()
+        # Market data for likely pairs is fetched here while the goal LLM call is in flight
+        self._prefetch_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="reasoner-prefetch")
+        # The backtest runs here while risk assessment runs on the calling thread
+        self._backtest_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="reasoner-backtest")
+
+    def _prefetch_market_data(self, pairs: List[str]) -> Tuple[float, Dict[str, Union[MarketData, Exception]]]:
+        results = self.market_client.get_market_data_batch(pairs)
+        return time.monotonic(), results
 
     def _call_llm(self, system_prompt: str, user_message: str, temperature: float = 0.7, max_tokens: int = 2000) -> str:
         messages = [
@@ -1966,24 +2796,34 @@ class AutonomousReasoningEngine:
             except Exception as e:
                 print(f"[WARN] CUDOS failed: {e}")
         
+        breaker = _breaker_for(self.llm_endpoint)
         headers = {
             "Authorization": f"Bearer {self.llm_key}",
             "Content-Type": "application/json",
         }
         try:
-            resp = requests.post(
+            breaker.before_call()
+            resp = _SESSION.post(
                 self.llm_endpoint + "/chat/completions",
                 headers=headers,
-                json={
+                data=_json_body({
                     "model": self.llm_model,
                     "messages": messages,
                     "temperature": temperature,
                     "max_tokens": max_tokens,
-                },
+                }),
                 timeout=60
             )
-            data = resp.json()
+            if resp.status_code >= 500:
+                breaker.record_failure()
+            else:
+                breaker.record_success()
+            data = _resp_json(resp)
             return (data.get("choices") or [{}])[0].get("message", {}).get("content", "")
+        except requests.RequestException as e:
+            breaker.record_failure()
+            print(f"[ERROR] LLM call failed: {e}")
+            raise Exception(f"LLM inference failed: {e}")
         except Exception as e:
             print(f"[ERROR] LLM call failed: {e}")
             raise Exception(f"LLM inference failed: {e}")
@@ -2010,6 +2850,10 @@ class AutonomousReasoningEngine:
             context_summary += f"\n\nPAST_TRADES_CONTEXT: {past_trades_context}"
         
         try:
+            # The goal step picks from config.pairs[:3] (or falls back to [:2]), so their market
+            # data doesn't depend on its answer: overlap that fetch with the LLM round-trip
+            prefetch = self._prefetch_pool.submit(self._prefetch_market_data, list(self.config.pairs[:3]))
+            
             # Step 1: Interpret goal
             print("[Step 1] Interpreting goal...")
             system1 = f"""You are a trading analyst that must respect the following symbolic constraints and user profile:
@@ -2020,7 +2864,7 @@ Return JSON: {{goal, preferred_pairs (list from {self.config.pairs[:3]})}}"""
             
             goal_output = self._call_llm(system1, user_input, temperature=0.5, max_tokens=300)
             try:
-                goal_data = json.loads(goal_output)
+                goal_data = _extract_json(goal_output)
                 pairs = [p for p in goal_data.get("preferred_pairs", []) if self.config.is_pair_valid(p)]
             except Exception as parse_e:
                 # If LLM did not return valid JSON, fall back to default pairs
@@ -2033,16 +2877,26 @@ Return JSON: {{goal, preferred_pairs (list from {self.config.pairs[:3]})}}"""
             
             # Step 2: Fetch REAL market data
             print("[Step 2] Fetching market data...")
+            try:
+                fetched_at, prefetched = prefetch.result()
+            except Exception:
+                fetched_at, prefetched = 0.0, {}
+            if time.monotonic() - fetched_at >= self.market_client.ticker_ttl:
+                prefetched = {}  # goal step was slow; don't reason on stale prices
+            pair_data = {p: prefetched[p] for p in pairs if isinstance(prefetched.get(p), MarketData)}
+            remaining = [p for p in pairs if p not in pair_data]
+            if remaining:
+                pair_data.update(self.market_client.get_market_data_batch(remaining))
+            
             market_data_dict = {}
-            for pair in pairs:
-                try:
-                    md = self.market_client.get_market_data(pair)
-                    market_data_dict[pair] = md
-                    print(f"  ✓ {pair}: ${md.current_price:.4f} | Vol: {md.volatility:.2f}%")
-                except Exception as e:
+            for pair in dict.fromkeys(pairs):
+                md = pair_data[pair]
+                if isinstance(md, Exception):
                     # Skip pairs that cannot be fetched instead of failing the whole reasoning step
-                    print(f"  ✗ {pair}: {e}")
+                    print(f"  ✗ {pair}: {md}")
                     continue
+                market_data_dict[pair] = md
+                print(f"  ✓ {pair}: ${md.current_price:.4f} | Vol: {md.volatility:.2f}%")
 
             if not market_data_dict:
                 raise Exception("No valid market data available for any candidate pairs")
@@ -2054,9 +2908,11 @@ Return JSON: {{goal, preferred_pairs (list from {self.config.pairs[:3]})}}"""
             # Optional: ask MeTTa for a symbolic strategy recommendation based on market conditions
             metta_recommended = None
             try:
+                # Bucketed (volatility to 1%, RSI to 5 points) so similar markets share one
+                # cached recommendation instead of a fresh MeTTa query per tick
                 market_conditions = {
-                    "volatility": md.volatility,
-                    "rsi": md.rsi,
+                    "volatility": float(round(md.volatility)),
+                    "rsi": float(round(md.rsi / 5) * 5),
                 }
                 metta_recommended = self.metta_kb.get_strategy_recommendation(market_conditions)
             except Exception as e:
@@ -2098,7 +2954,7 @@ Return ONLY valid JSON (no other text): {{name, entry_price, exit_price, stop_lo
                 }
             else:
                 try:
-                    strat_data = json.loads(strategy_output)
+                    strat_data = _extract_json(strategy_output)
                 except Exception as parse_e:
                     print(f"[WARN] Strategy JSON parse failed: {parse_e} | output={strategy_output!r}")
                     raise Exception("Strategy generation failed: LLM did not return valid JSON")
@@ -2131,7 +2987,7 @@ Return ONLY valid JSON (no other text): {{name, entry_price, exit_price, stop_lo
                 # Single refinement step: ask the LLM to repair the strategy based on validation issues
                 try:
                     issues_text = "\n".join([f"- {e}" for e in errors])
-                    strategy_json = json.dumps(asdict(strategy))
+                    strategy_json = _json_body(asdict(strategy)).decode()
                     system_refine = f"""You are a trading strategy repair engine.
 You must strictly obey these symbolic constraints and user profile:
 {context_summary}
@@ -2148,7 +3004,7 @@ Return ONLY JSON: {{name, entry_price, exit_price, stop_loss, take_profit, posit
 
                     refined_output = self._call_llm(system_refine, user_input, temperature=0.6, max_tokens=800)
                     try:
-                        refined_data = json.loads(refined_output)
+                        refined_data = _extract_json(refined_output)
                     except Exception as refine_parse_e:
                         print(f"[WARN] Strategy refinement JSON parse failed: {refine_parse_e} | output={refined_output!r}")
                         # If refinement fails to produce JSON, keep original strategy and continue.
@@ -2156,19 +3012,17 @@ Return ONLY JSON: {{name, entry_price, exit_price, stop_loss, take_profit, posit
 
                     refined_position_size = min(float(refined_data.get("position_size", position_size)), user_profile.max_position_size)
 
-                    strategy = Strategy(
-                        name=refined_data.get("name", strategy.name),
+                    # Only fields the LLM actually returned change; validation state is reset below
+                    updates = {k: float(refined_data[k]) for k in _REFINABLE_FLOAT_FIELDS if k in refined_data}
+                    updates.update((k, refined_data[k]) for k in ("name", "risk_level") if k in refined_data)
+                    strategy = replace(
+                        strategy,
                         description="Refined strategy after validation",
-                        entry_price=float(refined_data.get("entry_price", strategy.entry_price)),
-                        exit_price=float(refined_data.get("exit_price", strategy.exit_price)),
-                        position_size=refined_position_size,
-                        stop_loss=float(refined_data.get("stop_loss", strategy.stop_loss)),
-                        take_profit=float(refined_data.get("take_profit", strategy.take_profit)),
-                        expected_return=float(refined_data.get("expected_return", strategy.expected_return)),
-                        risk_level=refined_data.get("risk_level", strategy.risk_level),
                         rationale="Refined strategy",
-                        confidence=float(refined_data.get("confidence", strategy.confidence)),
-                        pair=primary_pair
+                        position_size=refined_position_size,
+                        validation_passed=False,
+                        validation_errors=[],
+                        **updates,
                     )
 
                     # Re-run validation on refined strategy (single refinement step only)
@@ -2185,6 +3039,11 @@ Return ONLY JSON: {{name, entry_price, exit_price, stop_loss, take_profit, posit
             else:
                 print("  ✓ Validation passed")
             
+            # Steps 5 and 6 only read the strategy and each engine has its own RNG, so they run concurrently
+            backtest_future = self._backtest_pool.submit(
+                self.backtest_engine.backtest_strategy, strategy, primary_pair, md
+            )
+            
             # Step 5: Risk assessment
             print("[Step 5] Risk assessment...")
             risk_metrics = self.risk_engine.assess_risk(strategy, md, self.config)
@@ -2192,7 +3051,7 @@ Return ONLY JSON: {{name, entry_price, exit_price, stop_loss, take_profit, posit
             
             # Step 6: Backtest
             print("[Step 6] Backtesting...")
-            backtest = self.backtest_engine.backtest_strategy(strategy, primary_pair, md)
+            backtest = backtest_future.result()
             strategy.backtested = True
             strategy.backtest_score = backtest.sharpe_ratio
             print(f"  Win Rate: {backtest.win_rate*100:.1f}% | Sharpe: {backtest.sharpe_ratio:.2f}")
@@ -2235,17 +3094,65 @@ Type "approve" to execute or "reject" to refine.
 
 # --- CONVERSATION LAYER ---
 
+class _LRUDict(OrderedDict):
+    """Dict capped at maxsize keys; reads and writes refresh a key, the stalest key is evicted.
+
+    on_evict(key, value) runs for each evicted entry (e.g. to flush it somewhere durable).
+    """
+
+    def __init__(self, maxsize: int, on_evict=None):
+        super().__init__()
+        self.maxsize = maxsize
+        self.on_evict = on_evict
+
+    def __getitem__(self, key):
+        value = super().__getitem__(key)
+        self.move_to_end(key)
+        return value
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self.move_to_end(key)
+        while len(self) > self.maxsize:
+            old_key, old_value = self.popitem(last=False)
+            if self.on_evict is not None:
+                self.on_evict(old_key, old_value)
+
+
+def _last_messages(messages: "deque[ConversationMessage]", n: int) -> List[ConversationMessage]:
+    """The last n messages of a conversation deque (deques don't slice)."""
+    return list(itertools.islice(messages, max(len(messages) - n, 0), None))
+
+
+def _append_conversation_log(user_id: str, messages: List[ConversationMessage]):
+    """Append messages to the JSONL conversation log as {"user_id", **message} lines."""
+    if not messages:
+        return
+    blob = b"".join(_json_body({"user_id": user_id, **asdict(m)}) + b"\n" for m in messages)
+    with open(CONVERSATION_LOG_FILE, 'ab') as f:
+        f.write(blob)
+
+
 class ConversationManager:
     """Manage multi-turn conversation with users."""
     
     def __init__(self):
-        self.user_conversations: Dict[str, List[ConversationMessage]] = {}
-        self.pending_strategies: Dict[str, AutonomousReasoning] = {}
+        # Least recently active users are dropped from memory (after flushing to the log)
+        self.user_conversations: Dict[str, "deque[ConversationMessage]"] = _LRUDict(
+            MAX_CONVERSATION_USERS, on_evict=self._flush
+        )
+        self.pending_strategies: Dict[str, AutonomousReasoning] = _LRUDict(MAX_CONVERSATION_USERS)
+        self._unsaved: DefaultDict[str, int] = defaultdict(int)  # messages not yet in the log, per user
+
+    def _flush(self, user_id: str, messages: "deque[ConversationMessage]"):
+        unsaved = self._unsaved.pop(user_id, 0)
+        if unsaved:
+            _append_conversation_log(user_id, _last_messages(messages, unsaved))
 
     def add_message(self, user_id: str, sender: str, content: str, message_type: str = "chat", 
                    reasoning_id: Optional[str] = None) -> ConversationMessage:
         if user_id not in self.user_conversations:
-            self.user_conversations[user_id] = []
+            self.user_conversations[user_id] = deque(maxlen=MAX_CONVERSATION_MESSAGES)
         
         msg = ConversationMessage(
             sender=sender,
@@ -2254,7 +3161,11 @@ class ConversationManager:
             message_type=message_type,
             related_reasoning_id=reasoning_id
         )
-        self.user_conversations[user_id].append(msg)
+        conversation = self.user_conversations[user_id]
+        if self._unsaved[user_id] == conversation.maxlen:
+            self._flush(user_id, conversation)  # the oldest unsaved message is about to fall off
+        conversation.append(msg)
+        self._unsaved[user_id] += 1
         return msg
 
     def get_conversation_history(self, user_id: str, limit: int = 10) -> List[Dict[str, str]]:
@@ -2262,7 +3173,7 @@ class ConversationManager:
         if user_id not in self.user_conversations:
             return []
         
-        messages = self.user_conversations[user_id][-limit:]
+        messages = _last_messages(self.user_conversations[user_id], limit)
         return [{"role": m.role, "content": m.content} for m in messages]
 
     def save_conversation(self, user_id: str):
@@ -2270,14 +3181,7 @@ class ConversationManager:
         if user_id not in self.user_conversations:
             return
         
-        try:
-            logs = json.load(open(CONVERSATION_LOG_FILE)) if os.path.exists(CONVERSATION_LOG_FILE) else {}
-        except:
-            logs = {}
-        
-        logs[user_id] = [asdict(m) for m in self.user_conversations[user_id]]
-        with open(CONVERSATION_LOG_FILE, 'w') as f:
-            json.dump(logs, f, indent=2)
+        self._flush(user_id, self.user_conversations[user_id])
 
 
 # --- MEMBASE CONVERSATION MANAGER (PRODUCTION MULTI-USER) ---
@@ -2293,7 +3197,7 @@ class MembaseConversationManager:
 
     def __init__(self, membase_account: str = MEMBASE_ACCOUNT):
         self.membase_account = membase_account
-        self.pending_strategies: Dict[str, AutonomousReasoning] = {}
+        self.pending_strategies: Dict[str, AutonomousReasoning] = _LRUDict(MAX_CONVERSATION_USERS)
         self._membase_available = False
         self._multi_memory = None
         self._lt_memory = None
@@ -2326,7 +3230,11 @@ class MembaseConversationManager:
                 print(f"[MEMBASE] Init failed: {e}")
 
         # Fallback local storage if Membase unavailable
-        self._local_conversations: Dict[str, List[ConversationMessage]] = {}
+        # Bounded local cache; Membase (or the JSONL log in fallback mode) holds the full history
+        self._local_conversations: Dict[str, "deque[ConversationMessage]"] = _LRUDict(
+            MAX_CONVERSATION_USERS, on_evict=self._flush_local
+        )
+        self._unsaved: DefaultDict[str, int] = defaultdict(int)  # local-fallback messages not yet logged
 
     def add_message(self, user_id: str, sender: str, content: str, message_type: str = "chat",
                     reasoning_id: Optional[str] = None) -> ConversationMessage:
@@ -2357,8 +3265,13 @@ class MembaseConversationManager:
 
         # Always keep local copy for immediate access
         if user_id not in self._local_conversations:
-            self._local_conversations[user_id] = []
-        self._local_conversations[user_id].append(msg)
+            self._local_conversations[user_id] = deque(maxlen=MAX_CONVERSATION_MESSAGES)
+        conversation = self._local_conversations[user_id]
+        if not self._membase_available:
+            if self._unsaved[user_id] == conversation.maxlen:
+                self._flush_local(user_id, conversation)  # the oldest unsaved message is about to fall off
+            self._unsaved[user_id] += 1
+        conversation.append(msg)
 
         return msg
 
@@ -2370,22 +3283,25 @@ class MembaseConversationManager:
             if self._membase_available:
                 try:
                     membase_msgs = self._multi_memory.get(conversation_id=user_id, recent_n=limit)
-                    self._local_conversations[user_id] = [
-                        ConversationMessage(
-                            sender=m.name,
-                            role=m.role,
-                            content=m.content,
-                            message_type="chat"
-                        )
-                        for m in membase_msgs
-                    ]
+                    self._local_conversations[user_id] = deque(
+                        (
+                            ConversationMessage(
+                                sender=m.name,
+                                role=m.role,
+                                content=m.content,
+                                message_type="chat"
+                            )
+                            for m in membase_msgs
+                        ),
+                        maxlen=MAX_CONVERSATION_MESSAGES,
+                    )
                 except Exception as e:
                     print(f"[MEMBASE] get_conversation_history failed: {e}")
                     return []
             else:
                 return []
 
-        messages = self._local_conversations[user_id][-limit:]
+        messages = _last_messages(self._local_conversations[user_id], limit)
         return [{"role": m.role, "content": m.content} for m in messages]
 
     def get_user_profile(self, user_id: str) -> str:
@@ -2418,16 +3334,15 @@ class MembaseConversationManager:
             # Membase auto-uploads; nothing to do
             return
 
-        # Fallback: save to local JSON
+        # Fallback: append new messages to the local JSONL log
         if user_id not in self._local_conversations:
             return
-        try:
-            logs = json.load(open(CONVERSATION_LOG_FILE)) if os.path.exists(CONVERSATION_LOG_FILE) else {}
-        except:
-            logs = {}
-        logs[user_id] = [asdict(m) for m in self._local_conversations[user_id]]
-        with open(CONVERSATION_LOG_FILE, 'w') as f:
-            json.dump(logs, f, indent=2)
+        self._flush_local(user_id, self._local_conversations[user_id])
+
+    def _flush_local(self, user_id: str, messages: "deque[ConversationMessage]"):
+        unsaved = self._unsaved.pop(user_id, 0)
+        if unsaved:
+            _append_conversation_log(user_id, _last_messages(messages, unsaved))
 
     def stop(self):
         """Clean shutdown of background threads."""
@@ -2859,7 +3774,6 @@ class AgentServer:
     def run_async(self):
         """Start the agent server in background thread."""
         if self._agent:
-            import threading
             thread = threading.Thread(target=self.run, daemon=True)
             thread.start()
             print(f"[AGENT] Agent server started in background")
@@ -3107,18 +4021,18 @@ Be concise and practical. You are NOT just an advisor - you are part of an autom
             
             messages = [{"role": "system", "content": system}] + history + [{"role": "user", "content": message}]
             
-            resp = requests.post(
+            resp = _SESSION.post(
                 self.llm_endpoint + "/chat/completions",
                 headers=llm_headers,
-                json={
+                data=_json_body({
                     "model": self.llm_model,
                     "messages": messages,
                     "temperature": 0.7,
                     "max_tokens": 1500,
-                },
+                }),
                 timeout=60
             )
-            data = resp.json()
+            data = _resp_json(resp)
             response = (data.get("choices") or [{}])[0].get("message", {}).get("content", "Unable to respond")
             
             self.conversation.add_message(user_id, "assistant", response, "chat")
@@ -1,10 +1,60 @@
 import os
+import asyncio
 import json
 import requests
-from typing import List, Dict, Optional, Any
-from dataclasses import dataclass, asdict, field
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from typing import List, Dict, Optional, Any, Union
+from dataclasses import dataclass, asdict, field, is_dataclass
 import datetime
+import atexit
+import hashlib
+import queue
 import re
+import threading
+import time
+from collections import OrderedDict, defaultdict, deque
+
+# orjson is a faster drop-in for the hot JSON paths; fall back to stdlib json if missing
+try:
+    import orjson
+    _ORJSON_AVAILABLE = True
+except ImportError:
+    _ORJSON_AVAILABLE = False
+
+
+def _json_default(obj: Any) -> Any:
+    if is_dataclass(obj):
+        return asdict(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _json_bytes(obj: Any, sort_keys: bool = False) -> bytes:
+    # orjson serializes dataclasses natively; stdlib json needs the asdict fallback
+    if _ORJSON_AVAILABLE:
+        return orjson.dumps(obj, option=orjson.OPT_SORT_KEYS if sort_keys else 0)
+    return json.dumps(obj, sort_keys=sort_keys, default=_json_default).encode()
+
+
+def _json_str(obj: Any) -> str:
+    return _json_bytes(obj).decode()
+
+
+_json_loads = orjson.loads if _ORJSON_AVAILABLE else json.loads
+
+# tiktoken gives exact counts for the context budget; ~4 chars/token is close enough without it
+try:
+    import tiktoken
+    _TOKEN_ENCODING = tiktoken.get_encoding("cl100k_base")
+except Exception:
+    _TOKEN_ENCODING = None
+
+
+def _count_tokens(text: str) -> int:
+    if _TOKEN_ENCODING is not None:
+        # encode_ordinary: special-token text such as "<|endoftext|>" in user input is counted, not rejected
+        return len(_TOKEN_ENCODING.encode_ordinary(text))
+    return len(text) // 4
 
 # Revised trigger logic for two-tiered intent separation
 EXPLICIT_EXECUTE_TERMS = [
@@ -13,6 +63,14 @@ EXPLICIT_EXECUTE_TERMS = [
     'add and activate', 'trade now', 'enable', 'save settings', 'update now', 'commit'
 ]
 
+CONFIG_KEYWORDS = [
+    'allowed pair', 'max trade', 'daily cap', 'ttl', 'spread', 'pause', 'strategy', 'policy', 'set', 'update'
+]
+TX_KEYWORDS = ['approve', 'ship', 'dock', 'invalidate', 'execute', 'sign', 'payload']
+CONFIG_PARAM_KEYWORDS = ["allowed pair", "max trade", "spread", "daily cap", "ttl", "strategy", "limit", "policy"]
+QUESTION_WORDS = ['what', 'how', 'can you', 'could you', 'would you', 'examples', 'example', 'show me', 'tell me', 'explain']
+SETUP_PHRASES = ['set up', 'setup', 'configure', 'create', 'add', 'want to', 'would like to']
+
 # LLM prompt now explicitly describes the difference
 LLM_CLASSIFY_PROMPT = """
 You are a safety-conscious Aqua Maker assistant. For every user message, classify the intent as one of:
@@ -33,12 +91,81 @@ IMPORTANT:
 LLM_API_ENDPOINT = os.getenv("LLM_API_ENDPOINT", "https://api.asi1.ai/v1")
 LLM_API_KEY = os.getenv("LLM_API_KEY", "sk_d95b81ac6db6406a82c9ba3baf078fa207b863c9a0d3422292c05033a3a2f397")
 LLM_MODEL = os.getenv("LLM_MODEL", "asi1-extended")
+LLM_STREAM = os.getenv("LLM_STREAM", "true").lower() == "true"
+# Mark the static system prompt as cacheable for providers that support prompt caching
+LLM_PROMPT_CACHE = os.getenv("LLM_PROMPT_CACHE", "false").lower() == "true"
+CONTEXT_TOKEN_BUDGET = int(os.getenv("CONTEXT_TOKEN_BUDGET", "1500"))
 
 headers = {
     "Authorization": f"Bearer {LLM_API_KEY}",
     "Content-Type": "application/json",
 }
 
+# Shared keep-alive session so LLM calls reuse pooled TCP/TLS connections
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(pool_connections=8, pool_maxsize=32, max_retries=Retry(total=2, backoff_factor=0.2)))
+_SESSION.mount("http://", HTTPAdapter(pool_connections=8, pool_maxsize=32, max_retries=Retry(total=2, backoff_factor=0.2)))
+
+# Patterns used on every inbound message, compiled once at import
+_PAIR_RE = re.compile(r'\b[A-Z]{2,6}/[A-Z]{2,6}\b')
+_NUM_RE = re.compile(r'\b\d+\b')
+
+
+def _keyword_re(terms: List[str]) -> "re.Pattern[str]":
+    """Compile a keyword list into one alternation so a single scan finds any substring hit."""
+    return re.compile("|".join(map(re.escape, terms)))
+
+
+_WORD_RE = re.compile(r"\w+")
+
+
+class _KeywordMatcher:
+    """
+    Single words are tested by set membership against the message's word tokens;
+    multi-word phrases go through one compiled alternation.
+    """
+    __slots__ = ("words", "phrase_re")
+
+    def __init__(self, terms: List[str]):
+        self.words = frozenset(t for t in terms if " " not in t)
+        phrases = [t for t in terms if " " in t]
+        self.phrase_re = _keyword_re(phrases) if phrases else None
+
+    def matches(self, tokens: frozenset, lmsg: str) -> bool:
+        if not self.words.isdisjoint(tokens):
+            return True
+        return self.phrase_re is not None and self.phrase_re.search(lmsg) is not None
+
+
+def _tokens(lmsg: str) -> frozenset:
+    return frozenset(_WORD_RE.findall(lmsg))
+
+
+# Matched against the lowercased message
+_EXECUTE_RE = _keyword_re(EXPLICIT_EXECUTE_TERMS)
+_CONFIG_PARAM_RE = _keyword_re(CONFIG_PARAM_KEYWORDS)
+_CONFIG_KW = _KeywordMatcher(CONFIG_KEYWORDS)
+_TX_KW = _KeywordMatcher(TX_KEYWORDS)
+_QUESTION_KW = _KeywordMatcher(QUESTION_WORDS)
+_SETUP_KW = _KeywordMatcher(SETUP_PHRASES)
+# fast_classify only short-cuts whole-word execute commands; questions and negations go to the LLM
+_EXECUTE_CMD_RE = re.compile(r"\b(?:%s)\b" % "|".join(map(re.escape, EXPLICIT_EXECUTE_TERMS)))
+_LEADING_QUESTION_RE = re.compile(r"^(?:what|how|why|when|where|which|who|is|are|am|can|could|would|should|do|does|did|will|shall)\b")
+_NEGATION_RE = re.compile(r"\b(?:not|no|never|dont|cancel)\b|n['’]t\b")
+_CONFIRM_RE = re.compile(r"^(?:confirm|yes,? do it|go ahead|approve this change)(?:[.!]\s*)?$")
+_GREETING_RE = re.compile(r"^(?:hi|hello|hey|yo|gm|good (?:morning|afternoon|evening)|thanks|thank you)\b[\s!.,]*(?:there)?[\s!.]*$")
+_HELP_RE = re.compile(r"^(?:help|\?|what can you do\??)$")
+
+# Second-resolution UTC timestamp, formatted at most once per second
+_TS_CACHE = [0, ""]
+
+
+def _now_iso() -> str:
+    t = int(time.time())
+    if t != _TS_CACHE[0]:
+        _TS_CACHE[:] = [t, datetime.datetime.fromtimestamp(t, datetime.timezone.utc).replace(tzinfo=None).isoformat()]
+    return _TS_CACHE[1]
+
 # --- DATA MODELS ---
 
 @dataclass
@@ -59,16 +186,16 @@ class TransactionPayload:
     abi_encoded_data: str  # Placeholder for ABI-encoded data (could be hex or descriptive for simulation)
     summary: str  # Human-readable summary
     state: str = "pending"  # 'pending', 'confirmed', 'cancelled'
-    created_at: str = field(default_factory=lambda: datetime.datetime.utcnow().isoformat())
+    created_at: str = field(default_factory=_now_iso)
     confirmed_by: Optional[str] = None
     confirmed_at: Optional[str] = None
 
 @dataclass
 class AuditLogEntry:
     intent: str
-    payload: dict
+    payload: Union[dict, TransactionPayload]  # serialized only when written
     confirmation: Optional[dict] = None
-    timestamp: str = field(default_factory=lambda: datetime.datetime.utcnow().isoformat())
+    timestamp: str = field(default_factory=_now_iso)
     state: str = "pending"  # 'pending', 'confirmed', 'cancelled'
 
 # Helper functions to load/dump these as JSON objects can be added as needed.
@@ -77,16 +204,33 @@ class AuditLogEntry:
 # Only MakerAgent and Aqua config/payload/audit log logic is present. No legacy schemas, prompts, or test outputs remain.
 
 MAKER_CONFIG_FILE = 'maker_config.json'
-AUDIT_LOG_FILE = 'audit_log.json'
+AUDIT_LOG_FILE = 'audit_log.jsonl'
+AUDIT_BATCH_SIZE = 64
+AUDIT_FSYNC_EVERY = 8  # fsync once per this many batches
+
+_last_config_hash: Optional[bytes] = None
+
 
 def save_maker_config(config: MakerConfig):
-    with open(MAKER_CONFIG_FILE, 'w') as f:
-        json.dump(asdict(config), f, indent=2)
+    # Skip no-op saves, and write via tmp + os.replace so a crash never leaves a torn file
+    global _last_config_hash
+    if _ORJSON_AVAILABLE:
+        blob = orjson.dumps(asdict(config), option=orjson.OPT_INDENT_2)
+    else:
+        blob = json.dumps(asdict(config), indent=2).encode()
+    h = hashlib.blake2b(blob, digest_size=16).digest()
+    if h == _last_config_hash and os.path.exists(MAKER_CONFIG_FILE):
+        return
+    tmp = MAKER_CONFIG_FILE + ".tmp"
+    with open(tmp, 'wb') as f:
+        f.write(blob)
+    os.replace(tmp, MAKER_CONFIG_FILE)
+    _last_config_hash = h
 
 def load_maker_config() -> MakerConfig:
     try:
-        with open(MAKER_CONFIG_FILE, 'r') as f:
-            data = json.load(f)
+        with open(MAKER_CONFIG_FILE, 'rb') as f:
+            data = _json_loads(f.read())
             return MakerConfig(**data)
     except FileNotFoundError:
         return MakerConfig()
@@ -94,42 +238,72 @@ def load_maker_config() -> MakerConfig:
         print('Failed to load maker config:', e)
         return MakerConfig()
 
-def append_audit_log(entry: AuditLogEntry):
-    try:
-        logs = load_audit_log()
-    except Exception:
-        logs = []
-    logs.append(asdict(entry))
-    with open(AUDIT_LOG_FILE, 'w') as f:
-        json.dump(logs, f, indent=2)
+# Audit entries are queued and appended as JSON lines by a background writer,
+# so callers never pay for disk I/O and each event costs O(1) instead of a full rewrite.
+_AUDIT_Q: "queue.Queue[Union[AuditLogEntry, dict]]" = queue.Queue()
+
+
+def _audit_writer():
+    batches = 0
+    while True:
+        batch = [_AUDIT_Q.get()]
+        while len(batch) < AUDIT_BATCH_SIZE:
+            try:
+                batch.append(_AUDIT_Q.get_nowait())
+            except queue.Empty:
+                break
+        try:
+            with open(AUDIT_LOG_FILE, 'a') as f:
+                f.write("\n".join(_json_str(e) for e in batch) + "\n")
+                batches += 1
+                if batches % AUDIT_FSYNC_EVERY == 0:
+                    f.flush()
+                    os.fsync(f.fileno())
+        except Exception as e:
+            print('Failed to write audit log:', e)
+        finally:
+            for _ in batch:
+                _AUDIT_Q.task_done()
+
+
+threading.Thread(target=_audit_writer, name="audit-log-writer", daemon=True).start()
+
+
+def flush_audit_log():
+    """Block until every queued audit entry has been written."""
+    _AUDIT_Q.join()
+
+
+atexit.register(flush_audit_log)
+
+
+def append_audit_log(entry: Union[AuditLogEntry, dict]):
+    _AUDIT_Q.put(entry)
 
 def load_audit_log() -> list:
+    logs = []
     try:
         with open(AUDIT_LOG_FILE, 'r') as f:
-            return json.load(f)
+            for line in f:
+                if line.strip():
+                    logs.append(_json_loads(line))
     except FileNotFoundError:
         return []
     except Exception as e:
         print('Failed to load audit log:', e)
-        return []
+    return logs
 
-def is_maker_intent(message: str) -> Optional[str]:
+def is_maker_intent(message: str, lmsg: Optional[str] = None) -> Optional[str]:
     """
     Quick pattern match for demo; real logic may use NLP/LLM.
     Returns type: 'config' or 'tx', or None if not relevant.
     """
-    config_keywords = [
-        'allowed pair', 'max trade', 'daily cap', 'ttl', 'spread', 'pause', 'strategy', 'policy', 'set', 'update'
-    ]
-    tx_keywords = [
-        'approve', 'ship', 'dock', 'invalidate', 'execute', 'sign', 'payload']
-    lm = message.lower()
-    for word in config_keywords:
-        if word in lm:
-            return 'config'
-    for word in tx_keywords:
-        if word in lm:
-            return 'tx'
+    lm = lmsg if lmsg is not None else message.lower()
+    tokens = _tokens(lm)
+    if _CONFIG_KW.matches(tokens, lm):
+        return 'config'
+    if _TX_KW.matches(tokens, lm):
+        return 'tx'
     return None
 
 def summary_for_intent(message: str, detected: str) -> str:
@@ -152,7 +326,7 @@ def build_tx_payload(message: str, detected: str) -> TransactionPayload:
 def build_audit_entry(message: str, payload: TransactionPayload) -> AuditLogEntry:
     return AuditLogEntry(
         intent=message,
-        payload=asdict(payload),
+        payload=payload,
         confirmation=None,
         state="pending"
     )
@@ -162,16 +336,36 @@ def build_audit_entry(message: str, payload: TransactionPayload) -> AuditLogEntr
 REQUIRED_ACTION_KEYWORDS = ["pair", "trade", "strategy", "cap", "allow", "ttl", "spread", "pause", "approve", "dock", "ship", "invalidate", "amount"]
 
 
-def has_required_details(message: str):
+def has_required_details(message: str, lmsg: Optional[str] = None):
     # Requires BOTH an explicit execute/commit/proceed term and a valid config param
-    lmsg = message.lower()
-    has_explicit = any(term in lmsg for term in EXPLICIT_EXECUTE_TERMS)
-    has_pair = re.search(r'\b[A-Z]{2,6}/[A-Z]{2,6}\b', message)
-    has_amount = re.search(r'\b\d+\b', message)
-    has_config_kw = any(x in lmsg for x in ["allowed pair", "max trade", "spread", "daily cap", "ttl", "strategy", "limit", "policy"][0:])
+    if lmsg is None:
+        lmsg = message.lower()
+    has_explicit = bool(_EXECUTE_RE.search(lmsg))
+    has_pair = _PAIR_RE.search(message)
+    has_amount = _NUM_RE.search(message)
+    has_config_kw = bool(_CONFIG_PARAM_RE.search(lmsg))
     # Only treat as actionable if explicit command (e.g., 'execute trade USD/ETH now')
     return has_explicit and (has_pair or has_config_kw or has_amount)
 
+def fast_classify(message: str, lmsg: Optional[str] = None) -> Optional[Dict[str, str]]:
+    """
+    Local pre-classifier for unambiguous messages so they skip the LLM round-trip.
+    Returns None when the message needs the remote classifier.
+    """
+    if lmsg is None:
+        lmsg = message.strip().lower()
+    if _CONFIRM_RE.match(lmsg):
+        return {"intent": "confirm", "response": ""}
+    if _GREETING_RE.match(lmsg):
+        return {"intent": "smalltalk", "response": "Hi! I'm your Aqua Maker assistant. I can explain trading pairs, walk you through configuration, or prepare a change for you to confirm."}
+    if _HELP_RE.match(lmsg):
+        return {"intent": "help", "response": "I can help you configure Aqua Maker: allowed pairs, max trade size, daily caps, TTL ranges, spread presets, pausing, and strategies. Ask for examples, or say 'execute' with a pair and amount when you're ready."}
+    if lmsg.endswith("?") or _LEADING_QUESTION_RE.match(lmsg) or _NEGATION_RE.search(lmsg):
+        return None
+    if _EXECUTE_CMD_RE.search(lmsg) and (_PAIR_RE.search(message) or _NUM_RE.search(message)):
+        return {"intent": "action", "response": ""}
+    return None
+
 # --- Fetch.ai Agent Handler Template (for dynamic, message-based workflow) ---
 
 class MakerAgent:
@@ -189,25 +383,32 @@ class MakerAgent:
         self.llm_model = llm_model
         self.pending_payload = None
         self.pending_audit = None
-        self.histories = {}  # sender_id: list of (role, content)
+        self.histories = defaultdict(lambda: deque(maxlen=10))  # sender_id: last 10 (role, content)
 
     def update_history(self, sender, role, message):
-        if sender not in self.histories:
-            self.histories[sender] = []
         self.histories[sender].append((role, message))
-        self.histories[sender] = self.histories[sender][-10:]  # keep only last 10 messages
 
     def get_context(self, sender):
-        return [
-            {"role": r, "content": m}
-            for r, m in self.histories.get(sender, [])
-        ]
-
-    def handle_message(self, message, sender):
+        # Walk newest -> oldest and stop once the token budget is spent
+        context = []
+        used = 0
+        for r, m in reversed(self.histories.get(sender, ())):
+            used += _count_tokens(m)
+            if used > CONTEXT_TOKEN_BUDGET:
+                break
+            context.append({"role": r, "content": m})
+        context.reverse()
+        return context
+
+    async def handle_message(self, message, sender):
         # Add current user message to the conversation history before processing
         self.update_history(sender, "user", message)
-        context = self.get_context(sender)
-        classification = classify_user_intent_llm(self, message, context)
+        # Lowercased once per turn and shared by every keyword check below
+        lmsg = message.strip().lower()
+        classification = fast_classify(message, lmsg)
+        if classification is None:
+            context = self.get_context(sender)
+            classification = await classify_user_intent_llm_async(self, message, context)
         intent = classification.get("intent", None)
         extra_response = classification.get("response", "")
 
@@ -215,25 +416,26 @@ class MakerAgent:
         if intent == "confirm":
             if self.pending_payload and self.pending_audit:
                 last_summary = self.pending_payload.summary.strip().lower() if self.pending_payload and self.pending_payload.summary else ""
-                lmsg = message.strip().lower()
                 if lmsg == "confirm" or (last_summary and last_summary in lmsg):
                     who = sender
-                    now = datetime.datetime.utcnow().isoformat()
+                    now = _now_iso()
                     self.pending_payload.state = 'confirmed'
                     self.pending_payload.confirmed_by = who
                     self.pending_payload.confirmed_at = now
                     self.pending_audit.state = 'confirmed'
                     self.pending_audit.confirmation = {'by': who, 'at': now}
-                    append_audit_log(self.pending_audit)
+                    # One asdict() pass feeds both the audit log and the reply
+                    audit_dict = asdict(self.pending_audit)
+                    append_audit_log(audit_dict)
                     out = {
                         'type': 'confirmed_action',
-                        'payload': asdict(self.pending_payload),
-                        'audit_log_entry': asdict(self.pending_audit),
+                        'payload': audit_dict['payload'],
+                        'audit_log_entry': audit_dict,
                         'info': 'Audit log updated. No on-chain TX executed (demo).'
                     }
                     self.send_message(sender, out)
                     # Update conversation history with agent response
-                    self.update_history(sender, "assistant", json.dumps(out))
+                    self.update_history(sender, "assistant", _json_str(out))
                     self.pending_payload = None
                     self.pending_audit = None
                 else:
@@ -242,19 +444,19 @@ class MakerAgent:
                         'info': f"To confirm, please reply with: confirm {last_summary}"
                     }
                     self.send_message(sender, out)
-                    self.update_history(sender, "assistant", json.dumps(out))
+                    self.update_history(sender, "assistant", _json_str(out))
             else:
                 out = {
                     'type': 'no_pending_action',
                     'info': "There's nothing pending confirmation."
                 }
                 self.send_message(sender, out)
-                self.update_history(sender, "assistant", json.dumps(out))
+                self.update_history(sender, "assistant", _json_str(out))
             return
 
         # --- Pending action creation guardrail ---
         if intent == 'action':
-            if has_required_details(message):
+            if has_required_details(message, lmsg):
                 payload = build_tx_payload(message, intent)
                 audit_entry = build_audit_entry(message, payload)
                 self.pending_payload = payload
@@ -266,34 +468,32 @@ class MakerAgent:
                     'instruction': f'Reply with "confirm {payload.summary}" to execute.'
                 }
                 self.send_message(sender, out)
-                self.update_history(sender, "assistant", json.dumps(out))
+                self.update_history(sender, "assistant", _json_str(out))
             else:
                 out = {
                     'type': 'clarification_needed',
                     'info': "To create or update a config/transaction, please specify the trading pair, amount, and action you want to perform."
                 }
                 self.send_message(sender, out)
-                self.update_history(sender, "assistant", json.dumps(out))
+                self.update_history(sender, "assistant", _json_str(out))
             return
 
         # --- Help/enquiry/smalltalk/unknown/fallback ---
         if intent in ("help", "smalltalk", "enquiry", "unknown"):
             out = {'type': intent, 'info': extra_response}
             self.send_message(sender, out)
-            self.update_history(sender, "assistant", json.dumps(out))
+            self.update_history(sender, "assistant", _json_str(out))
         else:
             # Fallback: Detect questions, examples requests, or non-execution intent
-            lmsg = message.lower()
-            has_pair = re.search(r'\b[A-Z]{2,6}/[A-Z]{2,6}\b', message)
-            has_execute = any(term in lmsg for term in EXPLICIT_EXECUTE_TERMS)
+            has_pair = _PAIR_RE.search(message)
+            has_execute = bool(_EXECUTE_RE.search(lmsg))
+            tokens = _tokens(lmsg)
             
             # Check for question words or example requests
-            question_words = ['what', 'how', 'can you', 'could you', 'would you', 'examples', 'example', 'show me', 'tell me', 'explain']
-            is_question = any(word in lmsg for word in question_words) or message.strip().endswith('?')
+            is_question = _QUESTION_KW.matches(tokens, lmsg) or message.strip().endswith('?')
             
             # Check for setup/configuration intent without execution
-            setup_phrases = ['set up', 'setup', 'configure', 'create', 'add', 'want to', 'would like to']
-            has_setup_intent = any(phrase in lmsg for phrase in setup_phrases) and not has_execute
+            has_setup_intent = _SETUP_KW.matches(tokens, lmsg) and not has_execute
             
             if is_question or has_setup_intent or (has_pair and not has_execute):
                 # User is asking questions or expressing interest, not executing - treat as enquiry
@@ -306,7 +506,7 @@ class MakerAgent:
             else:
                 out = {'type': 'unsupported', 'info': "I'm not sure what you want to do. Try 'help' or ask for an example."}
             self.send_message(sender, out)
-            self.update_history(sender, "assistant", json.dumps(out))
+            self.update_history(sender, "assistant", _json_str(out))
 
     def send_message(self, recipient, data):
         """
@@ -319,6 +519,57 @@ class MakerAgent:
 
 # Update classify_user_intent_llm to use message context
 
+# LRU of parsed classifications keyed by (model, digest of the full prompt)
+CLASSIFY_CACHE_SIZE = int(os.getenv("CLASSIFY_CACHE_SIZE", "4096"))
+_CLASSIFY_CACHE: "OrderedDict[tuple, dict]" = OrderedDict()
+# Classifications run on to_thread workers, so every cache access holds this lock
+_CLASSIFY_CACHE_LOCK = threading.Lock()
+
+
+def _prompt_digest(prompt_messages: List[Dict[str, str]]) -> bytes:
+    return hashlib.blake2b(_json_bytes(prompt_messages, sort_keys=True)).digest()
+
+
+def _read_streamed_content(resp) -> str:
+    """
+    Accumulate SSE `delta.content` chunks and stop reading as soon as the
+    buffer holds a complete JSON object; the rest of the stream is dropped.
+    """
+    parts = []
+    try:
+        for raw in resp.iter_lines():
+            if not raw or not raw.startswith(b"data:"):
+                continue
+            data = raw[5:].strip()
+            if data == b"[DONE]":
+                break
+            chunk = _json_loads(data)
+            delta = ((chunk.get("choices") or [{}])[0].get("delta") or {}).get("content")
+            if not delta:
+                continue
+            parts.append(delta)
+            if "}" in delta:
+                content = "".join(parts)
+                try:
+                    _json_loads(content)
+                    return content
+                except ValueError:
+                    pass
+    finally:
+        resp.close()
+    return "".join(parts)
+
+
+# Built once so every request starts with a byte-identical prefix; servers with
+# prefix/KV caching (e.g. vLLM --enable-prefix-caching) then skip re-prefilling it.
+if LLM_PROMPT_CACHE:
+    _SYSTEM_MESSAGE = {"role": "system", "content": [
+        {"type": "text", "text": LLM_CLASSIFY_PROMPT, "cache_control": {"type": "ephemeral"}}
+    ]}
+else:
+    _SYSTEM_MESSAGE = {"role": "system", "content": LLM_CLASSIFY_PROMPT}
+
+
 def classify_user_intent_llm(agent, message, context):
     # Fix: system prompt always comes first, then chat history, then current user message
     endpoint = agent.llm_endpoint
@@ -328,29 +579,60 @@ def classify_user_intent_llm(agent, message, context):
         "Authorization": f"Bearer {key}",
         "Content-Type": "application/json",
     }
-    prompt_messages = [
-        {"role": "system", "content": LLM_CLASSIFY_PROMPT}
-    ]
+    prompt_messages = [_SYSTEM_MESSAGE]
     prompt_messages += context
     prompt_messages.append({"role": "user", "content": message})
+    cache_key = (model, _prompt_digest(prompt_messages))
+    with _CLASSIFY_CACHE_LOCK:
+        cached = _CLASSIFY_CACHE.get(cache_key)
+        if cached is not None:
+            _CLASSIFY_CACHE.move_to_end(cache_key)
+            return dict(cached)
     try:
-        resp = requests.post(endpoint + "/chat/completions", headers=headers, json={
+        resp = _SESSION.post(endpoint + "/chat/completions", headers=headers, json={
             "model": model,
             "messages": prompt_messages,
-        }, timeout=30)
-        data = resp.json()
-        content = (
-            (data.get("choices") or [{}])[0]
-            .get("message", {})
-            .get("content", "")
-        )
-        obj = json.loads(content) if content else {"intent": "unknown", "response": "I'm not sure how to help with that."}
-        return obj
+            "stream": LLM_STREAM,
+        }, timeout=30, stream=LLM_STREAM)
+        resp.raise_for_status()
+        if resp.headers.get("Content-Type", "").startswith("text/event-stream"):
+            content = _read_streamed_content(resp)
+        else:
+            data = _json_loads(resp.content)
+            content = (
+                (data.get("choices") or [{}])[0]
+                .get("message", {})
+                .get("content", "")
+            )
+        if not content:
+            return {"intent": "unknown", "response": "I'm not sure how to help with that."}
+        obj = _json_loads(content)
+        if not isinstance(obj, dict):
+            raise ValueError("classifier reply is not a JSON object")
+        # Only a well-formed classification is cached; errors and empty replies are retried next time
+        with _CLASSIFY_CACHE_LOCK:
+            _CLASSIFY_CACHE[cache_key] = obj
+            if len(_CLASSIFY_CACHE) > CLASSIFY_CACHE_SIZE:
+                _CLASSIFY_CACHE.popitem(last=False)
+        return dict(obj)
     except Exception as e:
         return {"intent": "help", "response": "Sorry, there was a problem processing your request. I can help you configure Aqua Maker or show you examples."}
 
+async def classify_user_intent_llm_async(agent, message, context):
+    """
+    Awaitable wrapper so the event loop keeps serving other senders while one waits on the LLM.
+    The blocking call runs in the default executor and still shares the pooled session.
+    """
+    return await asyncio.to_thread(classify_user_intent_llm, agent, message, context)
+
+async def dispatch_batch(agent: MakerAgent, messages: List[str]):
+    """Run a batch of messages concurrently, one simulated sender per message."""
+    await asyncio.gather(*[agent.handle_message(m, f"u{i}") for i, m in enumerate(messages)])
+
 # Instantiate with fetch env provided
 if __name__ == "__main__":
+    import sys
+
     class PrintBackAgent(MakerAgent):
         def send_message(self, recipient, data):
             print(f"\n--- Message to {recipient} ---")
@@ -362,9 +644,22 @@ if __name__ == "__main__":
         os.getenv('LLM_MODEL'),
     )
 
+    # AGENT_BATCH=<file> (or AGENT_BATCH=1 for stdin): newline-delimited messages dispatched concurrently
+    batch_source = os.getenv("AGENT_BATCH")
+    if batch_source:
+        if os.path.isfile(batch_source):
+            with open(batch_source, 'r') as f:
+                lines = f.read().splitlines()
+        else:
+            lines = sys.stdin.read().splitlines()
+        msgs = [line for line in lines if line.strip()]
+        asyncio.run(dispatch_batch(agent, msgs))
+        flush_audit_log()
+        sys.exit(0)
+
     print("--- Manual Test Mode ---")
     while True:
         user = input("Type a message for the agent (or 'exit' to quit): ")
         if user.lower() == "exit":
             break
-        agent.handle_message(user, "manual_tester")
+        asyncio.run(agent.handle_message(user, "manual_tester"))
@@ -1,27 +1,180 @@
+import atexit
+import datetime
 import json
+import mmap
 import os
 import re
 import hashlib
 import time
-from typing import Dict, Any, Optional, List, Tuple
+import types
+import functools
+import weakref
+from dataclasses import dataclass
+import itertools
+import queue
+import threading
+from typing import Dict, Any, Optional, List, Tuple, Iterator
+
+# orjson (C, SIMD) for the persistence paths; stdlib json is the fallback
+try:
+    import orjson
+    _ORJSON_AVAILABLE = True
+except ImportError:
+    _ORJSON_AVAILABLE = False
+
+# msgpack for the binary audit log; without it the log stays JSON lines
+try:
+    import msgpack
+    _MSGPACK_AVAILABLE = True
+except ImportError:
+    _MSGPACK_AVAILABLE = False
 
 # --- Configuration ---
 # Simulating Unibase Membase by using a local JSON file for persistence
 DB_FILE_TEMPLATE = "maker_config_{user_id}.json"
-AUDIT_LOG_FILE = "maker_agent_audit.log"
+# "msgpack" (self-delimiting binary frames) or "jsonl" (human-readable)
+AUDIT_LOG_FORMAT = os.getenv("AUDIT_LOG_FORMAT", "msgpack").lower()
+if AUDIT_LOG_FORMAT == "msgpack" and not _MSGPACK_AVAILABLE:
+    AUDIT_LOG_FORMAT = "jsonl"
+AUDIT_LOG_FILE = "maker_agent_audit.msgpack" if AUDIT_LOG_FORMAT == "msgpack" else "maker_agent_audit.log"
+# Config writes are coalesced; at most one flush per interval unless forced
+CONFIG_FLUSH_INTERVAL_SEC = 0.5
+# Above this size configs are parsed straight from an mmap (orjson only); below it a plain read is cheaper
+CONFIG_MMAP_THRESHOLD_BYTES = 4096
+
+# --- NLU pattern (compiled once, matched against the lowercased message) ---
+# One alternation, tried in priority order; the outer named group of the branch
+# that matched becomes `lastgroup`. Verb intents must match the whole message.
+_INTENT_RE = re.compile(
+    r"(?P<status>(?:status|show status|show config)\Z)"
+    r"|(?P<pause>(?:pause|pause strategy|pause quotes)\Z)"
+    r"|(?P<resume>(?:resume|unpause|start quotes)\Z)"
+    r"|(?P<set>set (?P<set_key>.*) to (?P<set_val>.*))"
+    r"|(?P<onboard>onboard (?P<ob_name>.*) with (?P<ob_amt>.*) (?P<ob_tok>.*))"
+    r"|(?P<allow>(?P<allow_verb>allow|disallow) pair (?P<allow_pair>.*))"
+)
+_CURRENCY_STRIP = re.compile(r"[,$]")
+
+# Per-key parsers for NLU string values; keys not listed are kept as strings
+_CONFIG_PARSERS = {
+    "allowed_pairs": lambda v: [pair.strip().upper() for pair in v.split(",")],
+    "max_trade_size_usd": lambda v: float(_CURRENCY_STRIP.sub("", v)),
+    "daily_cap_usd": lambda v: float(_CURRENCY_STRIP.sub("", v)),
+    "ttl_range_sec": lambda v: [int(t.strip()) for t in v.split("-")],
+    "is_paused": lambda v: v.lower() in ('true', '1', 'yes'),
+}
+
+def _json_dumps(obj: Any, pretty: bool = False) -> bytes:
+    """Serializes to UTF-8 JSON bytes: compact by default, 2-space indented when `pretty`."""
+    if _ORJSON_AVAILABLE:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if pretty else 0)
+    if pretty:
+        return json.dumps(obj, indent=2).encode()
+    return json.dumps(obj, separators=(",", ":")).encode()
+
+_json_loads = orjson.loads if _ORJSON_AVAILABLE else json.loads
+
+_last_ts_sec = [0, ""]
+
+def _fast_iso() -> str:
+    """UTC ISO-8601 timestamp, formatted once per wall-clock second."""
+    now = int(time.time())
+    if now != _last_ts_sec[0]:
+        _last_ts_sec[:] = [now, datetime.datetime.fromtimestamp(now, datetime.timezone.utc).isoformat()]
+    return _last_ts_sec[1]
+
+class _AuditLogWriter:
+    """
+    Keeps one long-lived append handle to the audit log and drains writes on a
+    daemon thread, so confirm_action never waits on disk I/O.
+    """
+
+    def __init__(self, path: str):
+        self._fh = open(path, 'ab', buffering=8192)
+        self._queue: "queue.SimpleQueue[Optional[Tuple[bytes, bool]]]" = queue.SimpleQueue()
+        self._thread = threading.Thread(target=self._run, name="audit-log-writer", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def write(self, line: bytes, flush: bool = False):
+        """Queues a serialized line; `flush` pushes it past the buffer once written."""
+        self._queue.put((line, flush))
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                break
+            line, flush = item
+            try:
+                self._fh.write(line)
+                if flush:
+                    self._fh.flush()
+            except Exception as e:
+                print(f"Failed to write to audit log: {e}")
+
+    def close(self):
+        """Drains pending lines, then flushes and closes the handle."""
+        if self._fh.closed:
+            return
+        self._queue.put(None)
+        self._thread.join(timeout=5)
+        self._fh.close()
+
+_audit_writer: Optional[_AuditLogWriter] = None
+
+def _encode_audit_entry(entry: Dict[str, Any]) -> bytes:
+    """Encodes one audit record in the configured AUDIT_LOG_FORMAT."""
+    if AUDIT_LOG_FORMAT == "msgpack":
+        return msgpack.packb(entry)
+    return _json_dumps(entry) + b"\n"
+
+def read_audit_log(path: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+    """Streams audit records back from disk, one dict at a time."""
+    path = path or AUDIT_LOG_FILE
+    if not os.path.exists(path):
+        return
+    with open(path, 'rb') as f:
+        if AUDIT_LOG_FORMAT == "msgpack":
+            yield from msgpack.Unpacker(f, raw=False)
+        else:
+            for line in f:
+                if line.strip():
+                    yield _json_loads(line)
+
+def _get_audit_writer() -> _AuditLogWriter:
+    """Returns the process-wide audit writer, opening the log on first use."""
+    global _audit_writer
+    if _audit_writer is None:
+        _audit_writer = _AuditLogWriter(AUDIT_LOG_FILE)
+    return _audit_writer
+
+@functools.lru_cache(maxsize=256)
+def _strategy_digest(data: bytes) -> str:
+    """
+    20-byte BLAKE2b hex digest (the mock strategy-hash length), memoized so one
+    strategy payload is hashed once.
+    """
+    return hashlib.blake2b(data, digest_size=20).hexdigest()
 
 # --- MOCK WEB3/CONTRACTS ---
 # These classes simulate interactions with on-chain contracts (e.g., Aqua, Executor)
 # They return mock data and transaction payloads as specified.
 
+_AQUA_ADDR = "0xAquaContract"
+_EXEC_ADDR = "0xExecutorContract"
+# Fields shared by every mock tx; copied, never mutated
+_TX_TEMPLATE = {"value": 0, "gasLimit": 250000}
+# Seeded from wall time once; strictly increasing within the process
+_NONCE = itertools.count(int(time.time()))
+
 def _get_mock_tx_payload(func_name: str, params: Dict[str, Any]) -> Dict[str, Any]:
     """Helper to create a realistic-looking (but fake) tx payload."""
     return {
-        "to": f"0x{'AquaContract' if 'aqua' in func_name else 'ExecutorContract'}",
+        "to": _AQUA_ADDR if func_name.startswith("aqua.") else _EXEC_ADDR,
         "data": f"0x_function_{func_name}_with_params_{params}",
-        "value": 0,
-        "gasLimit": 250000,
-        "nonce": int(time.time())
+        **_TX_TEMPLATE,
+        "nonce": next(_NONCE)
     }
 
 class MockAquaContract:
@@ -46,11 +199,13 @@ class MockAquaContract:
             "amount": amount
         })
 
-    def ship(self, executor: str, strategy_bytes: str, tokens: List[str], amounts: List[float]) -> Dict[str, Any]:
-        """Simulates preparing a 'ship' transaction."""
+    def ship(self, executor: str, strategy_bytes: str, tokens: List[str], amounts: List[float],
+             strategy_digest: Optional[str] = None) -> Dict[str, Any]:
+        """Simulates preparing a 'ship' transaction. Pass `strategy_digest` if already computed."""
+        digest = strategy_digest or _strategy_digest(strategy_bytes.encode())
         return _get_mock_tx_payload("aqua.ship", {
             "executor": executor,
-            "strategyBytes_hash": hashlib.sha256(strategy_bytes.encode()).hexdigest()[:10],
+            "strategyBytes_hash": digest[:10],
             "tokens": tokens,
             "amounts": amounts
         })
@@ -82,44 +237,112 @@ class MockWeb3Utils:
     
     def compute_strategy_hash(self, strategy_bytes: str) -> str:
         """Simulates computing the on-chain strategy hash."""
-        return "0x" + hashlib.sha256(strategy_bytes.encode()).hexdigest()[:40]
+        return "0x" + _strategy_digest(strategy_bytes.encode())
 
     def generate_strategy_bytes(self, strategy_name: str, params: Dict[str, Any]) -> str:
         """Simulates generating the strategyBytes template."""
         return f"<strategy name='{strategy_name}' params='{json.dumps(params)}' />"
 
+# --- NLU ---
+
+# Maps the matched _INTENT_RE branch to its tool call
+_INTENT_BUILDERS = {
+    "status": lambda m: {"intent": "get_status"},
+    "pause": lambda m: {"intent": "pause_strategy"},
+    "resume": lambda m: {"intent": "resume_strategy"},
+    "set": lambda m: {"intent": "set_config_value", "key": m["set_key"].strip(), "value": m["set_val"].strip()},
+    "onboard": lambda m: {"intent": "prepare_onboarding", "name": m["ob_name"], "amount": m["ob_amt"], "token": m["ob_tok"]},
+    "allow": lambda m: {"intent": "set_pair_allowed", "pair": m["allow_pair"], "allowed": m["allow_verb"] == "allow"},
+}
+
+@functools.lru_cache(maxsize=128)
+def _parse_intent(message: str) -> Optional[Dict[str, Any]]:
+    """
+    Pure regex intent parse of an already lowercased/stripped message.
+    Hits and misses are both cached; callers must not mutate the returned dict.
+    """
+    match = _INTENT_RE.match(message)
+    if not match:
+        return None # Unknown intent
+    return _INTENT_BUILDERS[match.lastgroup](match)
+
 # --- MAKER AGENT CORE ---
 
+# Agents that may hold unflushed config. Held weakly, so one exit hook covers every
+# live agent without keeping discarded ones alive for the life of the process.
+_live_agents: "weakref.WeakSet[MakerAgent]" = weakref.WeakSet()
+
+@atexit.register
+def _flush_live_agents():
+    for agent in list(_live_agents):
+        agent._force_flush()
+
+@dataclass
+class PendingAction:
+    """An action awaiting 'confirm'; `type` selects the branch in confirm_action."""
+    __slots__ = ("type", "payload")
+    type: str
+    payload: Dict[str, Any]
+
+    def audit_details(self) -> Dict[str, Any]:
+        """Flat {"type", **payload} audit record, without internal-only keys like bytes_digest."""
+        details = {"type": self.type, **self.payload}
+        details.pop("bytes_digest", None)
+        return details
+
 class MakerAgent:
     """
     Implements the "Maker Agent (Chat Control Plane)" spec.
     Manages conversational state, configuration, and tx preparation.
     """
+
+    # A simple mapping for NLU to config keys (shared, read-only)
+    KEY_MAP = types.MappingProxyType({
+        "allowed pairs": "allowed_pairs",
+        "max trade size": "max_trade_size_usd",
+        "daily cap": "daily_cap_usd",
+        "ttl range": "ttl_range_sec",
+        "spread preset": "spread_preset",
+        "strategy": "active_strategy_hash"
+    })
+
+    # Routes an NLU intent to its "propose_" / tool method
+    _DISPATCH = types.MappingProxyType({
+        "get_status": lambda self, d: self.get_status(),
+        "pause_strategy": lambda self, d: self.propose_pause_or_resume(pause=True),
+        "resume_strategy": lambda self, d: self.propose_pause_or_resume(pause=False),
+        "set_config_value": lambda self, d: self.propose_config_update(d['key'], d['value']),
+        "prepare_onboarding": lambda self, d: self.propose_onboarding(d['name'], d['amount'], d['token']),
+        "set_pair_allowed": lambda self, d: self.propose_set_pair_allowed(d['pair'], d['allowed']),
+    })
     
     def __init__(self, user_id: str):
         self.user_id = user_id
         self.db_path = DB_FILE_TEMPLATE.format(user_id=self.user_id)
+
+        # Debounced persistence: self.config is the source of truth, disk catches up
+        self._dirty = False
+        self._last_flush = 0.0
+        self._config_to_flush: Optional[Dict[str, Any]] = None
+        _live_agents.add(self)
         
-        # Core state
-        self.config: Dict[str, Any] = self._load_config()
-        self.pending_action: Optional[Dict[str, Any]] = None
+        # Core state (config is read from disk on first access)
+        self._config: Optional[Dict[str, Any]] = None
+        self.pending_action: Optional[PendingAction] = None
 
         # Mock contract/web3 instances
         self.aqua = MockAquaContract()
         self.executor = MockExecutorContract()
         self.web3_utils = MockWeb3Utils()
         
-        # A simple mapping for NLU to config keys
-        self.key_map = {
-            "allowed pairs": "allowed_pairs",
-            "max trade size": "max_trade_size_usd",
-            "daily cap": "daily_cap_usd",
-            "ttl range": "ttl_range_sec",
-            "spread preset": "spread_preset",
-            "strategy": "active_strategy_hash"
-        }
-        
-        print(f"MakerAgent initialized for user '{user_id}'. Config loaded from '{self.db_path}'.")
+        print(f"MakerAgent initialized for user '{user_id}'. Config file: '{self.db_path}' (loaded on first use).")
+
+    @property
+    def config(self) -> Dict[str, Any]:
+        """Maker config, lazily loaded so constructing an agent touches no disk."""
+        if self._config is None:
+            self._config = self._load_config()
+        return self._config
 
     def _get_default_config(self) -> Dict[str, Any]:
         """Returns a default config structure if no DB file is found."""
@@ -144,128 +367,124 @@ class MakerAgent:
             return cfg
         
         try:
-            with open(self.db_path, 'r') as f:
-                return json.load(f)
+            with open(self.db_path, 'rb') as f:
+                if _ORJSON_AVAILABLE and os.fstat(f.fileno()).st_size > CONFIG_MMAP_THRESHOLD_BYTES:
+                    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                        with memoryview(mm) as view:
+                            return orjson.loads(view)
+                return _json_loads(f.read())
         except Exception as e:
             print(f"Error loading config: {e}. Reverting to default.")
             return self._get_default_config()
 
     def _save_config(self, config: Dict[str, Any]):
         """
-        Saves maker config to the JSON file (simulating Unibase Membase).
+        Marks maker config dirty; the write to the JSON file (simulating Unibase Membase)
+        is debounced by _maybe_flush.
+        """
+        self._config_to_flush = config
+        self._dirty = True
+        self._maybe_flush()
+
+    def _maybe_flush(self):
+        """Flushes only if the last write is older than CONFIG_FLUSH_INTERVAL_SEC."""
+        if self._dirty and time.monotonic() - self._last_flush > CONFIG_FLUSH_INTERVAL_SEC:
+            self._force_flush()
+
+    def _force_flush(self):
         """
+        Writes pending config atomically (tmp file + os.replace).
+        """
+        if not self._dirty:
+            return
+        tmp_path = self.db_path + ".tmp"
         try:
-            with open(self.db_path, 'w') as f:
-                json.dump(config, f, indent=2)
+            with open(tmp_path, 'wb') as f:
+                f.write(_json_dumps(self._config_to_flush, pretty=True))
+            os.replace(tmp_path, self.db_path)
+            self._dirty = False
+            self._last_flush = time.monotonic()
         except Exception as e:
             print(f"Error saving config: {e}")
 
+    def close(self):
+        """Writes any pending config and drops the agent from the exit-time flush."""
+        self._force_flush()
+        _live_agents.discard(self)
+
+    def __del__(self):
+        # An agent dropped before exit must not lose its debounced config write
+        self._force_flush()
+
     def _audit_log(self, action_type: str, details: Dict[str, Any]):
         """
         Writes to an audit log for all confirmed actions.
         """
         log_entry = {
-            "timestamp": time.isoformat(time.gmtime()),
+            "timestamp": _fast_iso(),
             "user_id": self.user_id,
             "action": action_type,
             "details": details
         }
         print(f"\n[AUDIT LOG] {log_entry['timestamp']} | {self.user_id} | {action_type} | {details}")
         try:
-            with open(AUDIT_LOG_FILE, 'a') as f:
-                f.write(json.dumps(log_entry) + "\n")
+            # Tx-prep entries are flushed promptly; config edits ride the buffer
+            _get_audit_writer().write(_encode_audit_entry(log_entry), flush=action_type.startswith("tx_prep"))
         except Exception as e:
             print(f"Failed to write to audit log: {e}")
 
     # --- 1. Natural Language Understanding (Simulation) ---
     
-    def _simple_nlu(self, message: str) -> Optional[Dict[str, Any]]:
+    def _simple_nlu(self, normalized: str) -> Optional[Dict[str, Any]]:
         """
         Simulates "ASI Cloud inference for natural language + tool calling".
         Uses simple regex to map chat intents to tool calls.
+        `normalized` must already be lowercased and stripped (see handle_message).
         """
-        message = message.lower().strip()
-        
-        # Tool: get_status
-        if re.fullmatch(r"status|show status|show config", message):
-            return {"intent": "get_status"}
-            
-        # Tool: pause
-        if re.fullmatch(r"pause|pause strategy|pause quotes", message):
-            return {"intent": "pause_strategy"}
-
-        # Tool: resume
-        if re.fullmatch(r"resume|unpause|start quotes", message):
-            return {"intent": "resume_strategy"}
-        
-        # Tool: set_config_value
-        match = re.match(r"set (.*) to (.*)", message)
-        if match:
-            key, value = match.groups()
-            return {"intent": "set_config_value", "key": key.strip(), "value": value.strip()}
-        
-        # Tool: prepare_onboarding_txs
-        match = re.match(r"onboard (.*) with (.*) (.*)", message)
-        if match:
-            name, amount, token = match.groups()
-            return {"intent": "prepare_onboarding", "name": name, "amount": amount, "token": token}
-
-        # Tool: prepare_executor_policy_tx (setPairAllowed)
-        match = re.match(r"allow pair (.*)", message)
-        if match:
-            return {"intent": "set_pair_allowed", "pair": match.group(1), "allowed": True}
-        
-        match = re.match(r"disallow pair (.*)", message)
-        if match:
-            return {"intent": "set_pair_allowed", "pair": match.group(1), "allowed": False}
-
-        return None # Unknown intent
+        return _parse_intent(normalized)
 
     # --- 2. Tool-Callable Methods (Agent Responsibilities) ---
 
     def get_status(self) -> str:
         """[Tool] Responds with active strategies and remaining budgets."""
-        hash = self.config.get("active_strategy_hash", "0x_no_balance_hash_")
-        budgets = self.aqua.rawBalances(hash)
+        return "\n".join(self.iter_status())
+
+    def iter_status(self) -> Iterator[str]:
+        """
+        Yields the status report line by line, so streaming transports
+        (e.g. a websocket) can send each line as soon as it is formatted.
+        """
+        config = self.config
+        hash = config.get("active_strategy_hash", "0x_no_balance_hash_")
         
-        status_report = [
-            "--- Maker Agent Status ---",
-            f"User: {self.user_id}",
-            f"Status: {'PAUSED' if self.config.get('is_paused') else 'ACTIVE'}",
-            "\n[Configuration]",
-            f"  - Allowed Pairs: {self.config.get('allowed_pairs')}",
-            f"  - Max Trade Size: ${self.config.get('max_trade_size_usd')}",
-            f"  - Daily Cap: ${self.config.get('daily_cap_usd')}",
-            f"  - Spread Preset: {self.config.get('spread_preset')}",
-            f"  - Active Strategy: {hash}",
-            "\n[On-Chain Budgets]",
-        ]
+        yield "--- Maker Agent Status ---"
+        yield f"User: {self.user_id}"
+        yield f"Status: {'PAUSED' if config.get('is_paused') else 'ACTIVE'}"
+        yield "\n[Configuration]"
+        yield f"  - Allowed Pairs: {config.get('allowed_pairs')}"
+        yield f"  - Max Trade Size: ${config.get('max_trade_size_usd')}"
+        yield f"  - Daily Cap: ${config.get('daily_cap_usd')}"
+        yield f"  - Spread Preset: {config.get('spread_preset')}"
+        yield f"  - Active Strategy: {hash}"
+        yield "\n[On-Chain Budgets]"
+        
+        budgets = self.aqua.rawBalances(hash)
         if budgets:
             for token, amount in budgets.items():
-                status_report.append(f"  - {token}: {amount}")
+                yield f"  - {token}: {amount}"
         else:
-            status_report.append("  - No budgets found for active strategy.")
-            
-        return "\n".join(status_report)
+            yield "  - No budgets found for active strategy."
 
     def _parse_config_value(self, key: str, str_value: str) -> Any:
         """Safely parses string values from NLU into correct types."""
-        if key == "allowed_pairs":
-            return [pair.strip().upper() for pair in str_value.split(",")]
-        if key in ["max_trade_size_usd", "daily_cap_usd"]:
-            return float(re.sub(r"[,$]", "", str_value))
-        if key == "ttl_range_sec":
-            return [int(t.strip()) for t in str_value.split("-")]
-        if key == "is_paused":
-            return str_value.lower() in ['true', '1', 'yes']
-        return str_value # For spread_preset, active_strategy_hash
+        parser = _CONFIG_PARSERS.get(key)
+        return parser(str_value) if parser else str_value # For spread_preset, active_strategy_hash
 
     def propose_config_update(self, raw_key: str, str_value: str) -> str:
         """[Tool] Proposes a change to the MakerConfig."""
-        if raw_key not in self.key_map:
-            return f"Error: I don't know how to set '{raw_key}'. Valid keys are: {list(self.key_map.keys())}"
-        
-        key = self.key_map[raw_key]
+        key = self.KEY_MAP.get(raw_key)
+        if key is None:
+            return f"Error: I don't know how to set '{raw_key}'. Valid keys are: {list(self.KEY_MAP.keys())}"
         
         try:
             value = self._parse_config_value(key, str_value)
@@ -273,22 +492,20 @@ class MakerAgent:
             return f"Error: Invalid format for '{raw_key}'. Failed to parse '{str_value}'. ({e})"
         
         # Set pending action for confirmation
-        self.pending_action = {
-            "type": "update_config",
+        self.pending_action = PendingAction("update_config", {
             "key": key,
             "value": value
-        }
+        })
         
         return f"OK. I am ready to update '{key}' to '{value}'.\nPlease type 'confirm' to apply this change."
 
     def propose_pause_or_resume(self, pause: bool) -> str:
         """[Tool] Proposes pausing or resuming the strategy."""
         action_str = "pause" if pause else "resume"
-        self.pending_action = {
-            "type": "update_config",
+        self.pending_action = PendingAction("update_config", {
             "key": "is_paused",
             "value": pause
-        }
+        })
         return f"OK. I am ready to {action_str} all quoting strategies.\nPlease type 'confirm' to apply this change."
 
     def propose_onboarding(self, name: str, amount: str, token: str) -> str:
@@ -303,14 +520,14 @@ class MakerAgent:
         strategy_bytes = self.web3_utils.generate_strategy_bytes(name, params)
         strategy_hash = self.web3_utils.compute_strategy_hash(strategy_bytes)
         
-        self.pending_action = {
-            "type": "onboard_strategy",
+        self.pending_action = PendingAction("onboard_strategy", {
             "name": name,
             "bytes": strategy_bytes,
+            "bytes_digest": _strategy_digest(strategy_bytes.encode()),  # memoized by compute_strategy_hash
             "hash": strategy_hash,
             "token": token.upper(),
             "amount": amount_float
-        }
+        })
         
         summary = [
             f"OK. I am ready to onboard strategy '{name}'.",
@@ -326,16 +543,16 @@ class MakerAgent:
     def propose_set_pair_allowed(self, pair: str, allowed: bool) -> str:
         """[Tool] Prepares a tx to allow/disallow a pair on the executor."""
         action_str = "allow" if allowed else "disallow"
-        self.pending_action = {
-            "type": "set_pair_allowed",
-            "pair_address": f"0x_addr_for_{pair.upper()}",
+        pair_address = f"0x_addr_for_{pair.upper()}"
+        self.pending_action = PendingAction("set_pair_allowed", {
+            "pair_address": pair_address,
             "is_allowed": allowed
-        }
+        })
         
         summary = [
             f"OK. I am ready to {action_str} the pair '{pair.upper()}' on the executor.",
             "  - This will prepare 1 transaction:",
-            f"    1. setPairAllowed({self.pending_action['pair_address']}, {allowed})",
+            f"    1. setPairAllowed({pair_address}, {allowed})",
             "\nPlease type 'confirm' to generate this transaction payload."
         ]
         return "\n".join(summary)
@@ -352,62 +569,65 @@ class MakerAgent:
             
         action = self.pending_action
         self.pending_action = None # Clear action *before* execution
+        params = action.payload
         
         try:
             # --- Handle Config Update ---
-            if action["type"] == "update_config":
-                key = action['key']
-                value = action['value']
+            if action.type == "update_config":
+                key = params['key']
+                value = params['value']
                 self.config[key] = value
                 self._save_config(self.config)
                 self._audit_log("config_update", {"key": key, "value": value})
                 return f"Success. Configuration updated: '{key}' is now '{value}'."
 
             # --- Handle Onboarding TX Prep ---
-            elif action["type"] == "onboard_strategy":
+            elif action.type == "onboard_strategy":
                 old_hash = self.config.get("active_strategy_hash")
                 
                 # 1. Prepare approve tx
                 tx_approve = self.aqua.approve(
-                    token_address=f"0x_addr_for_{action['token']}",
+                    token_address=f"0x_addr_for_{params['token']}",
                     spender="0xAquaContract",
-                    amount=action['amount']
+                    amount=params['amount']
                 )
                 # 2. Prepare ship tx
                 tx_ship = self.aqua.ship(
                     executor="0xExecutorContract",
-                    strategy_bytes=action['bytes'],
-                    tokens=[f"0x_addr_for_{action['token']}"],
-                    amounts=[action['amount']]
+                    strategy_bytes=params['bytes'],
+                    strategy_digest=params['bytes_digest'],
+                    tokens=[f"0x_addr_for_{params['token']}"],
+                    amounts=[params['amount']]
                 )
                 # 3. Prepare dock tx (to remove old strategy)
                 tx_dock = self.aqua.dock(old_hash)
                 
-                # 4. Update config to point to new strategy
-                self.config["active_strategy_hash"] = action['hash']
+                # 4. Update config to point to new strategy (durable before payloads go out)
+                self.config["active_strategy_hash"] = params['hash']
                 self._save_config(self.config)
+                self._force_flush()
                 
-                self._audit_log("tx_prep.onboard", action)
+                self._audit_log("tx_prep.onboard", action.audit_details())
                 
                 response = [
                     "Success. Payloads generated. Please sign and send these transactions:",
-                    f"\n[TX 1: APPROVE]\n{json.dumps(tx_approve, indent=2)}",
-                    f"\n[TX 2: SHIP NEW STRATEGY]\n{json.dumps(tx_ship, indent=2)}",
-                    f"\n[TX 3: DOCK OLD STRATEGY]\n{json.dumps(tx_dock, indent=2)}",
-                    f"\nConfig updated. Active strategy is now: {action['hash']}"
+                    f"\n[TX 1: APPROVE]\n{_json_dumps(tx_approve).decode()}",
+                    f"\n[TX 2: SHIP NEW STRATEGY]\n{_json_dumps(tx_ship).decode()}",
+                    f"\n[TX 3: DOCK OLD STRATEGY]\n{_json_dumps(tx_dock).decode()}",
+                    f"\nConfig updated. Active strategy is now: {params['hash']}"
                 ]
                 return "\n".join(response)
 
             # --- Handle Executor Policy TX Prep ---
-            elif action["type"] == "set_pair_allowed":
+            elif action.type == "set_pair_allowed":
                 tx_set_pair = self.executor.setPairAllowed(
-                    pair_address=action['pair_address'],
-                    is_allowed=action['is_allowed']
+                    pair_address=params['pair_address'],
+                    is_allowed=params['is_allowed']
                 )
-                self._audit_log("tx_prep.set_pair", action)
+                self._audit_log("tx_prep.set_pair", action.audit_details())
                 response = [
                     "Success. Payload generated. Please sign and send this transaction:",
-                    f"\n[TX 1: SET PAIR ALLOWED]\n{json.dumps(tx_set_pair, indent=2)}"
+                    f"\n[TX 1: SET PAIR ALLOWED]\n{_json_dumps(tx_set_pair).decode()}"
                 ]
                 return "\n".join(response)
 
@@ -433,12 +653,13 @@ class MakerAgent:
         Main entry point for the conversational interface.
         Routes user input to the correct logic.
         """
+        norm = message.lower().strip()
         
         # 1. Handle special commands (confirm/cancel)
-        if message.lower().strip() == "confirm":
+        if norm == "confirm":
             return self.confirm_action()
             
-        if message.lower().strip() == "cancel":
+        if norm == "cancel":
             return self.cancel_action()
             
         # 2. Safety check: Don't allow new actions if one is pending
@@ -446,7 +667,7 @@ class MakerAgent:
             return "You have a pending action. Please type 'confirm' or 'cancel'."
             
         # 3. Pass message to NLU
-        intent_data = self._simple_nlu(message)
+        intent_data = self._simple_nlu(norm)
         
         if not intent_data:
             return "Sorry, I don't understand that request. Try 'status', 'pause', or 'set <key> to <value>'."
@@ -454,26 +675,12 @@ class MakerAgent:
         # 4. Route intent to the correct "propose_" method
         intent = intent_data.get("intent")
         
-        try:
-            if intent == "get_status":
-                return self.get_status()
-            
-            if intent == "pause_strategy":
-                return self.propose_pause_or_resume(pause=True)
-
-            if intent == "resume_strategy":
-                return self.propose_pause_or_resume(pause=False)
-                
-            if intent == "set_config_value":
-                return self.propose_config_update(intent_data['key'], intent_data['value'])
-                
-            if intent == "prepare_onboarding":
-                return self.propose_onboarding(intent_data['name'], intent_data['amount'], intent_data['token'])
-                
-            if intent == "set_pair_allowed":
-                return self.propose_set_pair_allowed(intent_data['pair'], intent_data['allowed'])
-                
+        handler = self._DISPATCH.get(intent)
+        if handler is None:
             return "Sorry, that intent is not fully implemented."
+        
+        try:
+            return handler(self, intent_data)
             
         except Exception as e:
             return f"An error occurred while processing your request: {e}"